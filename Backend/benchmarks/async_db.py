@@ -0,0 +1,120 @@
+"""Benchmark request throughput of sync vs async database sessions under parallel clients.
+
+Serves the same paper lookup twice from an in-process app: once through a
+synchronous Session inside an `async def` handler (the previous pattern, which
+blocks the event loop for every query) and once through an AsyncSession. A
+SQLite database stands in for MySQL; every query calls a `db_latency()` SQL
+function that sleeps, simulating the network round trip to the server.
+
+    python -m Backend.benchmarks.async_db [--clients 32] [--requests 256] [--latency-ms 5]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from Backend.core.database import Base
+from Backend.models.comment import Comment  # noqa: F401  (resolves ResearchPaper.comments)
+from Backend.models.research_papers import ResearchPaper
+
+PAPERS = 100
+
+
+def _add_latency_function(engine, seconds):
+    @event.listens_for(engine, "connect")
+    def register(dbapi_connection, _):
+        dbapi_connection.create_function("db_latency", 0, lambda: time.sleep(seconds) or 1)
+
+
+def build_app(database_path, latency, pool_size):
+    url = f"sqlite:///{database_path}"
+    engine = create_engine(url, pool_size=pool_size, connect_args={"check_same_thread": False})
+    async_engine = create_async_engine(url.replace("sqlite", "sqlite+aiosqlite", 1), pool_size=pool_size)
+    _add_latency_function(engine, latency)
+    _add_latency_function(async_engine.sync_engine, latency)
+    SyncSession = sessionmaker(bind=engine)
+    AsyncSessionFactory = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    Base.metadata.create_all(engine, tables=[ResearchPaper.__table__])
+    with SyncSession() as db:
+        if not db.scalar(select(func.count(ResearchPaper.id))):
+            db.add_all(ResearchPaper(title=f"Paper {number}", author="Jane Doe", year=2024,
+                                     introduction="Introduction", file_path=f"uploads/{number}.pdf")
+                       for number in range(PAPERS))
+            db.commit()
+
+    def get_sync_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db():
+        async with AsyncSessionFactory() as db:
+            yield db
+
+    def lookup(paper_id):
+        return select(ResearchPaper).where(ResearchPaper.id == paper_id, func.db_latency() == 1)
+
+    app = FastAPI()
+
+    @app.get("/sync/{paper_id}")
+    async def sync_handler(paper_id: int, db: Session = Depends(get_sync_db)):
+        return {"title": db.scalar(lookup(paper_id)).title}
+
+    @app.get("/async/{paper_id}")
+    async def async_handler(paper_id: int, db: AsyncSession = Depends(get_async_db)):
+        return {"title": (await db.scalar(lookup(paper_id))).title}
+
+    return app, engine, async_engine
+
+
+async def run(app, path, clients, requests):
+    transport = httpx.ASGITransport(app=app)
+    pending = iter(range(requests))
+
+    async def client():
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+            for number in pending:
+                (await http.get(f"{path}/{number % PAPERS + 1}")).raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return time.perf_counter() - start
+
+
+async def bench(args):
+    with tempfile.TemporaryDirectory() as directory:
+        app, engine, async_engine = build_app(os.path.join(directory, "bench.db"), args.latency_ms / 1000,
+                                              args.clients)
+        try:
+            print(f"{args.clients} clients, {args.requests} requests, {args.latency_ms} ms per query")
+            print(f"{'session':<8} {'seconds':>8} {'req/s':>8}")
+            for label in ("sync", "async"):
+                await run(app, f"/{label}", args.clients, args.clients)  # warm the pools
+                seconds = await run(app, f"/{label}", args.clients, args.requests)
+                print(f"{label:<8} {seconds:>8.2f} {args.requests / seconds:>8.1f}")
+        finally:
+            engine.dispose()
+            await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=256)
+    parser.add_argument("--latency-ms", type=float, default=5)
+    args = parser.parse_args()
+    asyncio.run(bench(args))
+
+
+if __name__ == "__main__":
+    main()
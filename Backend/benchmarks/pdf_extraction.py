@@ -0,0 +1,116 @@
+"""Benchmark PDF metadata extraction over a generated corpus.
+
+Builds small, large and scanned-like (image only, no text layer) PDFs in a
+temporary directory and reports per-document time and peak Python memory for
+the page-bounded extractor and for the previous read-everything approach.
+
+Ingestion (core/ingestion.py `extract_pdf`) stops at the same point; the full
+page text store is filled afterwards, outside the upload. `extract_metadata_from_pdf`
+re-extracts from stored page text (decompressing only the pages it reads) or
+from a PDF.
+
+    python -m Backend.benchmarks.pdf_extraction [--runs 5] [--large-pages 300]
+"""
+import argparse
+import os
+import re
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+import fitz
+
+from Backend.core.pdf_metadata import extract_metadata_from_pdf
+
+LOREM = ("Scholarly systems index research papers and their authors. Results are reported "
+         "with statistical significance across several datasets and baselines. ") * 6
+
+
+def extract_metadata_full_text(pdf_path):
+    """The previous extractor: join every page, then run the regexes over it."""
+    doc = fitz.open(pdf_path)
+    text = "\n".join([page.get_text("text") for page in doc])
+    metadata = {}
+    title_match = re.search(r"(?m)^(.*?)(?:\n|$)", text)
+    metadata["title"] = title_match.group(1).strip() if title_match else "Unknown Title"
+    author_match = re.search(r"(?m)^\s*(.+?)\n.*\b(?:University|Institute|Department|Faculty)\b", text)
+    metadata["authors"] = author_match.group(1).strip() if author_match else "Unknown Authors"
+    year_match = re.search(r"\b(19\d{2}|20\d{2})\b", text)
+    metadata["year"] = year_match.group(1) if year_match else "Unknown Year"
+    intro_match = re.search(r"(?i)\bIntroduction\b(.*?)(?=\b(?:Methodology|Materials|Related Work|Background)\b)", text,
+                            re.DOTALL)
+    metadata["introduction"] = intro_match.group(1).strip() if intro_match else "Introduction not found"
+    doc.close()
+    return metadata
+
+
+def _write_text_pdf(path, pages):
+    doc = fitz.open()
+    for number in range(pages):
+        page = doc.new_page()
+        if number == 0:
+            text = ("Benchmarking Scholarly Search\nJane Doe, John Smith\nDepartment of Computing, "
+                    "University of Somewhere\n2024\n\nIntroduction\n" + LOREM + "\nMethodology\n" + LOREM)
+        else:
+            text = f"Section {number}\n" + LOREM
+        page.insert_textbox(fitz.Rect(50, 50, 550, 800), text, fontsize=9)
+    doc.save(path)
+    doc.close()
+
+
+def _write_scanned_pdf(path, pages):
+    pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 850, 1100), False)
+    pixmap.clear_with(200)
+    image = pixmap.tobytes("png")
+    doc = fitz.open()
+    for _ in range(pages):
+        doc.new_page().insert_image(fitz.Rect(0, 0, 595, 842), stream=image)
+    doc.save(path)
+    doc.close()
+
+
+def build_corpus(directory, large_pages):
+    corpus = {
+        "small": os.path.join(directory, "small.pdf"),
+        "large": os.path.join(directory, "large.pdf"),
+        "scanned": os.path.join(directory, "scanned.pdf"),
+    }
+    _write_text_pdf(corpus["small"], 2)
+    _write_text_pdf(corpus["large"], large_pages)
+    _write_scanned_pdf(corpus["scanned"], 20)
+    return corpus
+
+
+def measure(extractor, path, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        extractor(path)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    extractor(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--large-pages", type=int, default=300)
+    args = parser.parse_args()
+
+    extractors = {"page-bounded": extract_metadata_from_pdf, "full-text": extract_metadata_full_text}
+    with tempfile.TemporaryDirectory() as directory:
+        corpus = build_corpus(directory, args.large_pages)
+        print(f"{'document':<10} {'extractor':<13} {'median ms':>10} {'peak KiB':>10}")
+        for name, path in corpus.items():
+            for label, extractor in extractors.items():
+                seconds, peak = measure(extractor, path, args.runs)
+                print(f"{name:<10} {label:<13} {seconds * 1000:>10.2f} {peak / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
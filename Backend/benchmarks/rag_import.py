@@ -0,0 +1,70 @@
+"""Benchmark the cost of importing the RAG router, which every worker pays at startup.
+
+Each run imports `Backend.routers.uniqe_function` in a fresh interpreter and
+reports the median wall time. Two environments are measured: Qdrant unreachable
+(a non-routable QDRANT_URL, no network for OpenAI), and local backends
+(in-memory Qdrant, deterministic fake embeddings and chat model). A failed
+import is reported with its exception type. Interpreter startup and the modules
+the rest of the app imports anyway are timed first as the floor.
+
+    python -m Backend.benchmarks.rag_import [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+IMPORT = "import Backend.routers.uniqe_function"
+# Modules the rest of the app imports anyway (FastAPI, SQLAlchemy, PyMuPDF), the floor for the router
+SHARED = "import Backend.core.ingestion, Backend.core.storage"
+
+SCENARIOS = {
+    "qdrant unreachable": {
+        "QDRANT_URL": "http://10.255.255.1:6333",
+        "QDRANT_API_KEY": "benchmark",
+        "OPENAI_API_KEY": "sk-benchmark",
+    },
+    "local backends": {
+        "QDRANT_URL": "http://10.255.255.1:6333",
+        "QDRANT_API_KEY": "benchmark",
+        "OPENAI_API_KEY": "sk-benchmark",
+        "RAG_VECTOR_BACKEND": "memory",
+        "RAG_EMBEDDINGS": "fake",
+        "RAG_CHAT_MODEL": "fake",
+    },
+}
+
+
+def time_import(code: str, env: dict, timeout: float) -> tuple[float, str]:
+    start = time.perf_counter()
+    try:
+        result = subprocess.run([sys.executable, "-c", code], env={**os.environ, **env},
+                                capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return time.perf_counter() - start, f"timed out after {timeout:.0f}s"
+    elapsed = time.perf_counter() - start
+    if result.returncode:
+        lines = result.stderr.strip().splitlines()
+        return elapsed, f"failed ({lines[-1].split(':')[0] if lines else result.returncode})"
+    return elapsed, "ok"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    for name, code in (("interpreter startup", "pass"), ("shared app modules", SHARED)):
+        baseline = [time_import(code, {}, args.timeout)[0] for _ in range(args.runs)]
+        print(f"{name:<28}{statistics.median(baseline):8.3f}s")
+    for name, env in SCENARIOS.items():
+        results = [time_import(IMPORT, env, args.timeout) for _ in range(args.runs)]
+        statuses = {status for _, status in results}
+        print(f"{name:<28}{statistics.median(elapsed for elapsed, _ in results):8.3f}s  {', '.join(sorted(statuses))}")
+
+
+if __name__ == "__main__":
+    main()
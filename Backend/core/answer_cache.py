@@ -0,0 +1,129 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+# Answer cache settings from .env
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "1024"))
+ANSWER_CACHE_TTL = float(os.getenv("ANSWER_CACHE_TTL", "3600"))
+# Cosine similarity above which a different question reuses an answer; 0 matches exact questions only
+ANSWER_CACHE_SIMILARITY = float(os.getenv("ANSWER_CACHE_SIMILARITY", "0"))
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_question(question: str) -> str:
+    """Case, surrounding whitespace and punctuation, and runs of spaces don't change the question."""
+    return _SPACES.sub(" ", question.casefold()).strip(" ?!.")
+
+
+class AnswerCache:
+    """Bounded LRU + TTL cache of chat answers keyed by normalized question.
+
+    With a `similarity` threshold, a question that misses exactly is also matched
+    against the embeddings of cached questions by cosine similarity. The whole cache
+    is dropped whenever the vector collection changes; answers computed before a
+    change (a different `generation`) are not stored. Each worker has its own cache,
+    so changes made through another worker are only picked up after `ttl`.
+    """
+
+    def __init__(self, max_entries: int = ANSWER_CACHE_MAX_ENTRIES, ttl: float = ANSWER_CACHE_TTL,
+                 similarity: float = ANSWER_CACHE_SIMILARITY):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity = similarity
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # normalized question -> (expires_at, unit vector or None, answer)
+        self.generation = 0
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    @property
+    def semantic(self) -> bool:
+        return self.similarity > 0
+
+    def _get_exact(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[2]
+
+    def _get_similar(self, vector: np.ndarray):
+        now = time.monotonic()
+        candidates = [(key, entry[1]) for key, entry in self._entries.items()
+                      if entry[1] is not None and entry[0] >= now]
+        if not candidates:
+            return None
+        scores = np.stack([candidate for _, candidate in candidates]) @ vector
+        best = int(np.argmax(scores))
+        if scores[best] < self.similarity:
+            return None
+        key = candidates[best][0]
+        self._entries.move_to_end(key)
+        return self._entries[key][2]
+
+    async def aget(self, question: str, embed_query=None):
+        """Cached answer for `question` (or None) and the question's unit vector, if it was embedded.
+
+        `embed_query` is only awaited when semantic matching is on and the exact lookup missed.
+        """
+        key = normalize_question(question)
+        with self._lock:
+            answer = self._get_exact(key)
+            if answer is not None:
+                self.exact_hits += 1
+                return answer, None
+        vector = None
+        if self.semantic and embed_query is not None:
+            vector = _unit(await embed_query(key))
+            with self._lock:
+                answer = self._get_similar(vector)
+                if answer is not None:
+                    self.semantic_hits += 1
+                    return answer, vector
+        with self._lock:
+            self.misses += 1
+        return None, vector
+
+    def set(self, question: str, answer: dict, vector: np.ndarray = None, generation: int = None):
+        key = normalize_question(question)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return  # The collection changed while this answer was being computed
+            self._entries.pop(key, None)
+            self._entries[key] = (time.monotonic() + self.ttl, vector, answer)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def stats(self) -> dict:
+        hits = self.exact_hits + self.semantic_hits
+        lookups = hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "similarity": self.similarity,
+        }
+
+
+def _unit(vector) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+answer_cache = AnswerCache()
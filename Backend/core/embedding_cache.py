@@ -0,0 +1,141 @@
+import array
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from langchain_core.embeddings import Embeddings
+from starlette.concurrency import run_in_threadpool
+
+from Backend.core.storage import UPLOAD_DIR
+
+# On-disk embedding cache settings from .env
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", os.path.join(UPLOAD_DIR, "embeddings.sqlite3"))
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "200000"))
+
+# SQLite caps the number of bound parameters per statement
+LOOKUP_BATCH = 500
+
+
+def embedding_key(model: str, text: str) -> str:
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """SQLite table of key -> float32 vector, evicting the least recently used rows beyond `max_entries`."""
+
+    def __init__(self, path: str = EMBEDDING_CACHE_PATH, max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS ix_embeddings_last_used ON embeddings (last_used)")
+        self._connection.commit()
+
+    def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), LOOKUP_BATCH):
+                chunk = keys[start:start + LOOKUP_BATCH]
+                rows = self._connection.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+                for key, blob in rows:
+                    found[key] = array.array("f", blob).tolist()
+            if found:
+                now = time.time()
+                self._connection.executemany("UPDATE embeddings SET last_used = ? WHERE key = ?",
+                                             [(now, key) for key in found])
+                self._connection.commit()
+        return found
+
+    def set_many(self, items: dict[str, list[float]]):
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                [(key, array.array("f", vector).tobytes(), now) for key, vector in items.items()])
+            (count,) = self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+            if count > self.max_entries:
+                self._connection.execute(
+                    "DELETE FROM embeddings WHERE key IN "
+                    "(SELECT key FROM embeddings ORDER BY last_used LIMIT ?)", (count - self.max_entries,))
+            self._connection.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute("DELETE FROM embeddings")
+            self._connection.commit()
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that reuses stored vectors for text it has embedded before.
+
+    Keys are (model, sha256 of the chunk text), so re-indexing unchanged content
+    makes no calls to the wrapped model; only cache misses (deduplicated) are sent
+    to it. Queries are passed straight through.
+    """
+
+    def __init__(self, embeddings: Embeddings, store: EmbeddingStore, model: str = None):
+        self.embeddings = embeddings
+        self.store = store
+        self.model = model or getattr(embeddings, "model", None) or type(embeddings).__name__
+        self._counter_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, texts: list[str]) -> tuple[list[str], dict[str, list[float]], dict[str, str]]:
+        keys = [embedding_key(self.model, text) for text in texts]
+        found = self.store.get_many(list(dict.fromkeys(keys)))
+        missing = {}  # key -> text, in first-seen order
+        for key, text in zip(keys, texts):
+            if key not in found:
+                missing.setdefault(key, text)
+        miss_count = sum(1 for key in keys if key not in found)
+        with self._counter_lock:
+            self.misses += miss_count
+            self.hits += len(keys) - miss_count
+        return keys, found, missing
+
+    def _complete(self, keys, found, missing, vectors) -> list[list[float]]:
+        computed = dict(zip(missing, vectors))
+        self.store.set_many(computed)
+        found.update(computed)
+        return [found[key] for key in keys]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys, found, missing = self._lookup(texts)
+        vectors = self.embeddings.embed_documents(list(missing.values())) if missing else []
+        return self._complete(keys, found, missing, vectors)
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys, found, missing = await run_in_threadpool(self._lookup, texts)
+        vectors = await self.embeddings.aembed_documents(list(missing.values())) if missing else []
+        return await run_in_threadpool(self._complete, keys, found, missing, vectors)
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embeddings.embed_query(text)
+
+    async def aembed_query(self, text: str) -> list[float]:
+        return await self.embeddings.aembed_query(text)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "model": self.model,
+            "entries": len(self.store),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,73 @@
+import email.utils
+import os
+import re
+
+from fastapi import HTTPException, Request, Response
+from starlette.responses import FileResponse
+
+from Backend.core.response_cache import etag_matches
+
+# How long browsers may reuse a delivered file before revalidating it
+PAPER_FILE_MAX_AGE = int(os.getenv("PAPER_FILE_MAX_AGE", "3600"))
+THUMBNAIL_MAX_AGE = int(os.getenv("THUMBNAIL_MAX_AGE", str(30 * 24 * 3600)))
+FILE_CHUNK_SIZE = int(os.getenv("FILE_CHUNK_SIZE", str(256 * 1024)))
+
+# Stored uploads are named after the SHA-256 of their content (see core/storage.py)
+CONTENT_ADDRESSED = re.compile(r"^[0-9a-f]{64}$")
+
+
+class PathSendFileResponse(FileResponse):
+    """FileResponse that hands whole-file bodies to the server when it supports
+    the ASGI `http.response.pathsend` extension (zero-copy sendfile), and reads
+    in FILE_CHUNK_SIZE chunks otherwise. Range requests use Starlette's handling.
+    """
+
+    chunk_size = FILE_CHUNK_SIZE
+
+    async def __call__(self, scope, receive, send):
+        self.pathsend = "http.response.pathsend" in scope.get("extensions", {})
+        await super().__call__(scope, receive, send)
+
+    async def _handle_simple(self, send, send_header_only: bool):
+        if not self.pathsend or send_header_only:
+            return await super()._handle_simple(send, send_header_only)
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        await send({"type": "http.response.pathsend", "path": str(self.path)})
+
+
+def file_etag(path: str, stat_result: os.stat_result) -> str:
+    """Strong ETag: the content hash for content-addressed files, size and mtime otherwise."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if CONTENT_ADDRESSED.match(stem):
+        return f'"{stem}"'
+    return f'"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"'
+
+
+def _not_modified_since(request: Request, stat_result: os.stat_result) -> bool:
+    header = request.headers.get("if-modified-since")
+    if not header or "if-none-match" in request.headers:
+        return False
+    try:
+        since = email.utils.parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return False
+    return int(stat_result.st_mtime) <= since
+
+
+def file_response(request: Request, path: str, media_type: str, filename: str = None,
+                  inline: bool = True, max_age: int = PAPER_FILE_MAX_AGE) -> Response:
+    """Serve a stored file with Range support, a strong ETag, Last-Modified and 304s."""
+    try:
+        stat_result = os.stat(path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    headers = {
+        "ETag": file_etag(path, stat_result),
+        "Last-Modified": email.utils.formatdate(stat_result.st_mtime, usegmt=True),
+        "Cache-Control": f"max-age={max_age}",
+    }
+    if etag_matches(request, headers["ETag"]) or _not_modified_since(request, stat_result):
+        return Response(status_code=304, headers=headers)
+    return PathSendFileResponse(path, media_type=media_type, filename=filename, headers=headers,
+                                stat_result=stat_result, content_disposition_type="inline" if inline else "attachment")
@@ -0,0 +1,319 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import fitz
+from starlette.concurrency import run_in_threadpool
+
+from Backend.core.database import SessionLocal
+from Backend.core.jobs import DONE, FAILED, QUEUED, RUNNING, JobRegistry
+from Backend.core.page_text import ensure_pages, remove_pages
+from Backend.core.paper_hooks import index_paper
+from Backend.core.search_index import SEARCH_BODY_BOOST, search_index
+from Backend.core.pdf_metadata import extract_metadata_from_doc
+from Backend.core.storage import StoredFile
+from Backend.core.thumbnails import remove_thumbnails, try_render_thumbnails
+from Backend.models.research_papers import ResearchPaper
+from Backend.schemas.research_papers import ResearchPaperResponse
+
+logger = logging.getLogger(__name__)
+
+# Ingestion tuning from .env
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", str(os.cpu_count() or 1)))
+INGEST_START_METHOD = os.getenv("INGEST_START_METHOD")  # e.g. "spawn"; platform default when unset
+INGEST_MAX_JOBS = int(os.getenv("INGEST_MAX_JOBS", "1000"))
+
+upload_jobs = JobRegistry(max_jobs=INGEST_MAX_JOBS)
+
+_pool = None
+_pool_lock = threading.Lock()
+_tasks = set()  # Strong references so running jobs are not garbage collected
+_in_flight = {}  # stored file path -> id of the job ingesting it
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            context = multiprocessing.get_context(INGEST_START_METHOD) if INGEST_START_METHOD else None
+            _pool = ProcessPoolExecutor(max_workers=INGEST_WORKERS, mp_context=context)
+        return _pool
+
+
+def shutdown_process_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+
+# 📌 Worker-side ingestion: metadata from the first pages only, and the first-page thumbnails
+# from the same open document. The full page text is stored after the paper is saved.
+def extract_pdf(file_path: str) -> dict:
+    doc = fitz.open(file_path)
+    try:
+        metadata = extract_metadata_from_doc(doc)
+        try_render_thumbnails(doc, file_path)
+    finally:
+        doc.close()
+    return metadata
+
+
+async def _store_page_text(paper: dict):
+    """Extract every page of a saved paper for search, RAG indexing and re-extraction."""
+    file_path = paper["file_path"]
+    try:
+        await asyncio.get_running_loop().run_in_executor(get_process_pool(), ensure_pages, file_path)
+    except Exception:
+        logger.exception("Storing the page text of %s failed; it is extracted on first use instead", file_path)
+        return
+    if not os.path.exists(file_path):  # The paper was deleted meanwhile
+        remove_pages(file_path)
+    elif SEARCH_BODY_BOOST > 0:
+        search_index.add_paper(SimpleNamespace(**paper))  # Now with its body text
+
+
+def store_page_text_later(papers: list[dict]):
+    """Store the page text of saved papers in the background, off the upload's critical path."""
+    for paper in papers:
+        task = asyncio.create_task(_store_page_text(paper))
+        _tasks.add(task)
+        task.add_done_callback(_tasks.discard)
+
+
+def is_ingesting(file_path: str) -> bool:
+    """True while an upload job or batch is extracting or inserting this stored file."""
+    return file_path in _in_flight
+
+
+# 📌 Find the paper already created from a stored file, if any
+def find_paper_by_path(file_path: str) -> dict | None:
+    db = SessionLocal()
+    try:
+        paper = db.query(ResearchPaper).filter(ResearchPaper.file_path == file_path).first()
+        return ResearchPaperResponse.model_validate(paper).model_dump() if paper else None
+    finally:
+        db.close()
+
+
+def _year(value) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def new_paper(metadata: dict, file_path: str) -> ResearchPaper:
+    return ResearchPaper(title=metadata["title"], author=metadata["authors"], year=_year(metadata["year"]),
+                         introduction=metadata["introduction"], file_path=file_path)
+
+
+def _index_saved(paper: ResearchPaper):
+    """Committed rows stay (and keep their files) even if updating the in-memory indexes fails."""
+    try:
+        index_paper(paper)
+    except Exception:
+        logger.exception("Indexing paper %s failed", paper.id)
+
+
+# 📌 Save extracted metadata as a new research paper
+def save_paper(metadata: dict, file_path: str) -> dict:
+    """Insert one paper; raises only if nothing was committed."""
+    db = SessionLocal(expire_on_commit=False)
+    try:
+        paper = new_paper(metadata, file_path)
+        db.add(paper)
+        db.flush()  # Assigns the id, so the response is validated before anything is committed
+        response = ResearchPaperResponse.model_validate(paper).model_dump()
+        db.commit()
+    finally:
+        db.close()
+    _index_saved(paper)
+    return response
+
+
+async def run_upload_job(job_id: str, file_path: str):
+    upload_jobs.update(job_id, status=RUNNING)
+    try:
+        loop = asyncio.get_running_loop()
+        metadata = await loop.run_in_executor(get_process_pool(), extract_pdf, file_path)
+        paper = await run_in_threadpool(save_paper, metadata, file_path)
+    except Exception as e:
+        logger.exception("Ingestion of %s failed", file_path)
+        _remove_file(file_path)  # Nothing was committed for it
+        upload_jobs.update(job_id, status=FAILED, error=str(e) or e.__class__.__name__)
+        return
+    finally:
+        _in_flight.pop(file_path, None)
+    upload_jobs.update(job_id, status=DONE, paper=paper)
+    store_page_text_later([paper])
+
+
+async def submit_upload(stored: StoredFile, filename: str) -> dict:
+    """Queue a stored PDF for extraction and return its job.
+
+    Re-uploads of a file that is already being ingested share the running job, and
+    re-uploads of an ingested file get a finished job pointing at the existing paper.
+    """
+    job_id = _in_flight.get(stored.path)
+    if job_id and (job := upload_jobs.get(job_id)):
+        return job
+
+    existing = await run_in_threadpool(find_paper_by_path, stored.path)
+    if existing:
+        return upload_jobs.create(filename=filename, status=DONE, paper=existing, duplicate=True)
+
+    job_id = _in_flight.get(stored.path)  # Another upload of the same file may have started meanwhile
+    if job_id and (job := upload_jobs.get(job_id)):
+        return job
+
+    job = upload_jobs.create(filename=filename, paper=None, duplicate=False)
+    _in_flight[stored.path] = job["id"]
+    task = asyncio.create_task(run_upload_job(job["id"], stored.path))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return job
+
+
+def _insert_papers(rows: list[tuple[dict, str]]) -> list[dict]:
+    """Insert papers in one transaction, validating every response before the commit."""
+    db = SessionLocal(expire_on_commit=False)
+    try:
+        papers = [new_paper(metadata, file_path) for metadata, file_path in rows]
+        db.add_all(papers)
+        db.flush()
+        responses = [ResearchPaperResponse.model_validate(paper).model_dump() for paper in papers]
+        db.commit()
+    finally:
+        db.close()
+    for paper in papers:
+        _index_saved(paper)
+    return responses
+
+
+# 📌 Batch ingestion: parallel extraction, one bulk insert
+def save_papers(rows: list[tuple[dict, str]]) -> list[dict | Exception]:
+    """Bulk insert; if the batch is rejected, every row is retried on its own.
+
+    Returns each row's paper, or the exception that kept that row from being committed.
+    """
+    try:
+        return _insert_papers(rows)
+    except Exception:
+        if len(rows) == 1:
+            raise
+        logger.exception("Bulk insert of %d papers failed, inserting them one by one", len(rows))
+    results = []
+    for row in rows:
+        try:
+            results.extend(_insert_papers([row]))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+def find_papers_by_paths(file_paths: list[str]) -> dict[str, dict]:
+    db = SessionLocal()
+    try:
+        papers = db.query(ResearchPaper).filter(ResearchPaper.file_path.in_(file_paths)).all()
+        return {paper.file_path: ResearchPaperResponse.model_validate(paper).model_dump() for paper in papers}
+    finally:
+        db.close()
+
+
+def _error(e: Exception) -> str:
+    return str(e) or e.__class__.__name__
+
+
+async def ingest_batch(items: list[dict]) -> list[dict]:
+    """Ingest stored PDFs together and fill in each item's report.
+
+    Each item has a "filename" and either a "stored" StoredFile or an "error". Files
+    already in the database, being ingested by an upload job, or earlier in the same
+    batch are reported as duplicates. The rest get an upload job (so single uploads of
+    the same bytes share it), are extracted in parallel on the process pool and are
+    inserted in one commit.
+    """
+    stored_paths = list({item["stored"].path for item in items if item.get("stored")})
+    existing = await run_in_threadpool(find_papers_by_paths, stored_paths) if stored_paths else {}
+
+    pending = {}  # path -> first item storing it
+    jobs = {}  # path -> id of the upload job registered for it
+    copies = []  # (item, first item with the same bytes)
+    for item in items:
+        stored = item.pop("stored", None)
+        item.setdefault("paper", None)
+        if stored is None:
+            item["status"] = FAILED
+        elif stored.path in existing:
+            item["status"] = "duplicate"
+            item["paper"] = existing[stored.path]
+        elif stored.path in pending:
+            item["status"] = "duplicate"
+            copies.append((item, pending[stored.path]))
+        elif stored.path in _in_flight:
+            item.update(status="duplicate", job_id=_in_flight[stored.path])
+        else:
+            item["status"] = QUEUED
+            pending[stored.path] = item
+            jobs[stored.path] = upload_jobs.create(filename=item["filename"], status=RUNNING, paper=None,
+                                                   duplicate=False)["id"]
+            _in_flight[stored.path] = jobs[stored.path]
+
+    try:
+        loop = asyncio.get_running_loop()
+        pool = get_process_pool()
+        paths = list(pending)
+        results = await asyncio.gather(*(loop.run_in_executor(pool, extract_pdf, path) for path in paths),
+                                       return_exceptions=True)
+
+        rows = []
+        for path, result in zip(paths, results):
+            if isinstance(result, Exception):
+                pending[path].update(status=FAILED, error=_error(result))
+                _remove_file(path)
+            else:
+                rows.append((result, path))
+
+        if rows:
+            try:
+                saved = await run_in_threadpool(save_papers, rows)
+            except Exception as e:
+                saved = [e] * len(rows)
+            for (_, path), paper in zip(rows, saved):
+                if isinstance(paper, Exception):
+                    logger.error("Inserting %s failed: %s", path, _error(paper))
+                    pending[path].update(status=FAILED, error=_error(paper))
+                    _remove_file(path)  # Only rows that were never committed lose their files
+                else:
+                    pending[path].update(status="created", paper=paper)
+    except Exception as e:
+        for item in pending.values():
+            if item["status"] == QUEUED:
+                item.update(status=FAILED, error=_error(e))
+        raise
+    finally:
+        for path, job_id in jobs.items():
+            item = pending[path]
+            upload_jobs.update(job_id, status=DONE if item["status"] == "created" else FAILED,
+                               paper=item["paper"], error=item.get("error"))
+            if _in_flight.get(path) == job_id:
+                del _in_flight[path]
+
+    store_page_text_later([item["paper"] for item in pending.values() if item["status"] == "created"])
+    # Duplicates within the batch point at whatever their first copy became
+    for item, first in copies:
+        item["paper"] = first["paper"]
+    return items
+
+
+def _remove_file(path: str):
+    if os.path.exists(path):
+        os.remove(path)
+    remove_thumbnails(path)
+    remove_pages(path)
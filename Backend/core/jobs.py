@@ -0,0 +1,54 @@
+import datetime
+import threading
+import uuid
+from collections import OrderedDict
+
+# Statuses a background job moves through
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class JobRegistry:
+    """Thread-safe, bounded in-memory registry of background job states.
+
+    Jobs are plain dicts so they can be returned straight from handlers. Once more
+    than `max_jobs` are tracked, the oldest finished jobs are forgotten.
+    """
+
+    def __init__(self, max_jobs: int = 1000):
+        self.max_jobs = max_jobs
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+
+    def create(self, **details) -> dict:
+        now = datetime.datetime.utcnow()
+        job = {"id": uuid.uuid4().hex, "status": QUEUED, "created_at": now, "updated_at": now,
+               "error": None}
+        job.update(details)
+        with self._lock:
+            self._jobs[job["id"]] = job
+            self._evict()
+            return dict(job)
+
+    def update(self, job_id: str, **changes) -> dict | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            job.update(changes, updated_at=datetime.datetime.utcnow())
+            return dict(job)
+
+    def get(self, job_id: str) -> dict | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def _evict(self):
+        if len(self._jobs) <= self.max_jobs:
+            return
+        for job_id in [job_id for job_id, job in self._jobs.items() if job["status"] in (DONE, FAILED)]:
+            del self._jobs[job_id]
+            if len(self._jobs) <= self.max_jobs:
+                return
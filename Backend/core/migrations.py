@@ -0,0 +1,44 @@
+import logging
+
+from sqlalchemy import inspect, text
+
+from Backend.models.research_papers import ResearchPaper
+
+logger = logging.getLogger(__name__)
+
+
+# 📌 Schema changes that create_all() does not apply to tables that already exist.
+# Every step checks the live schema first, so running them on each startup is safe.
+def upgrade_schema(engine):
+    _make_year_nullable(engine)
+    _create_missing_indexes(engine)
+
+
+def _create_missing_indexes(engine):
+    """Indexes declared on the model after its table was created, e.g. research_papers.file_path."""
+    table = ResearchPaper.__table__
+    inspector = inspect(engine)
+    if not inspector.has_table(table.name):
+        return
+    existing = {index["name"] for index in inspector.get_indexes(table.name)}
+    for index in table.indexes:
+        if index.name not in existing:
+            index.create(bind=engine)
+            logger.info("Created index %s", index.name)
+
+
+def _make_year_nullable(engine):
+    """research_papers.year is NULL when no year was found in the PDF."""
+    table = ResearchPaper.__tablename__
+    inspector = inspect(engine)
+    if not inspector.has_table(table):
+        return
+    column = next(column for column in inspector.get_columns(table) if column["name"] == "year")
+    if column["nullable"]:
+        return
+    if engine.dialect.name != "mysql":
+        logger.warning("%s.year is NOT NULL; papers without a year cannot be stored until it is made nullable", table)
+        return
+    with engine.begin() as connection:
+        connection.execute(text(f"ALTER TABLE {table} MODIFY year INT NULL"))
+    logger.info("Made %s.year nullable", table)
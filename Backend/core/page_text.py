@@ -0,0 +1,79 @@
+import os
+import struct
+import tempfile
+import zlib
+
+import fitz
+
+from Backend.core.storage import UPLOAD_DIR
+
+# Extracted page text is kept next to the uploads, one compressed sidecar per stored PDF
+TEXT_STORE_DIR = os.getenv("TEXT_STORE_DIR", os.path.join(UPLOAD_DIR, "text"))
+TEXT_STORE_COMPRESSION = int(os.getenv("TEXT_STORE_COMPRESSION", "6"))
+
+# Sidecar layout: MAGIC, page count, compressed length of every page, then the zlib blocks
+MAGIC = b"SVPT1\n"
+COUNT = struct.Struct("<I")
+
+os.makedirs(TEXT_STORE_DIR, exist_ok=True)
+
+
+def text_store_path(pdf_path: str) -> str:
+    """Sidecars are named after the stored PDF (its content hash), so identical files share one."""
+    stem = os.path.splitext(os.path.basename(pdf_path))[0]
+    return os.path.join(TEXT_STORE_DIR, f"{stem}.pages")
+
+
+def has_pages(pdf_path: str) -> bool:
+    return os.path.exists(text_store_path(pdf_path))
+
+
+def extract_pages(doc) -> list[str]:
+    """Text of every page of an open PyMuPDF document."""
+    return [page.get_text("text") for page in doc]
+
+
+def write_pages(pdf_path: str, pages: list[str]):
+    blocks = [zlib.compress(text.encode("utf-8"), TEXT_STORE_COMPRESSION) for text in pages]
+    header = MAGIC + COUNT.pack(len(blocks)) + struct.pack(f"<{len(blocks)}I", *map(len, blocks))
+    with tempfile.NamedTemporaryFile(dir=TEXT_STORE_DIR, suffix=".part", delete=False) as file:
+        file.write(header)
+        for block in blocks:
+            file.write(block)
+    os.replace(file.name, text_store_path(pdf_path))  # Readers never see a half-written sidecar
+
+
+def read_pages(pdf_path: str):
+    """Yield the stored page texts one at a time; pages not consumed are never decompressed."""
+    with open(text_store_path(pdf_path), "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not a page text store: {text_store_path(pdf_path)}")
+        (count,) = COUNT.unpack(file.read(COUNT.size))
+        lengths = struct.unpack(f"<{count}I", file.read(4 * count))
+        for length in lengths:
+            yield zlib.decompress(file.read(length)).decode("utf-8")
+
+
+def load_pages(pdf_path: str) -> list[str]:
+    """Page texts of a stored PDF, parsing it (and filling the store) only the first time."""
+    if has_pages(pdf_path):
+        return list(read_pages(pdf_path))
+    doc = fitz.open(pdf_path)
+    try:
+        pages = extract_pages(doc)
+    finally:
+        doc.close()
+    write_pages(pdf_path, pages)
+    return pages
+
+
+def ensure_pages(pdf_path: str):
+    """Fill the store for a stored PDF that has no sidecar yet."""
+    if not has_pages(pdf_path):
+        load_pages(pdf_path)
+
+
+def remove_pages(pdf_path: str):
+    path = text_store_path(pdf_path)
+    if os.path.exists(path):
+        os.remove(path)
@@ -0,0 +1,110 @@
+import base64
+import datetime
+import json
+import os
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import and_, func, or_, select
+
+# Page sizes from .env; `limit` can never exceed MAX_PAGE_SIZE
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "200"))
+
+# Response headers carrying the page metadata, so list bodies stay plain JSON arrays
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+class PageParams:
+    """Query parameters shared by every paginated list endpoint."""
+
+    def __init__(
+            self,
+            cursor: str | None = Query(None, description="Opaque cursor from the previous page's X-Next-Cursor header"),
+            limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+            include_total: bool = Query(False, description="Also return the total row count in X-Total-Count"),
+    ):
+        self.cursor = cursor
+        self.limit = limit
+        self.include_total = include_total
+
+
+def _encode_value(value):
+    if isinstance(value, datetime.datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = [_decode_value(value) for value in json.loads(raw)]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def keyset_after(order: list, values: list):
+    """Condition selecting the rows that sort after `values` for the given (column, descending) order."""
+    clauses = []
+    for position, (column, descending) in enumerate(order):
+        equal_before = [previous == value for (previous, _), value in zip(order[:position], values)]
+        step = column < values[position] if descending else column > values[position]
+        clauses.append(and_(*equal_before, step))
+    return or_(*clauses)
+
+
+def page_statement(statement, order: list, page: PageParams):
+    """Apply the cursor, the stable ordering and limit + 1 (to detect a next page)."""
+    if page.cursor:
+        statement = statement.where(keyset_after(order, decode_cursor(page.cursor, len(order))))
+    ordering = [column.desc() if descending else column.asc() for column, descending in order]
+    return statement.order_by(*ordering).limit(page.limit + 1)
+
+
+def count_statement(statement):
+    return select(func.count()).select_from(statement.order_by(None).subquery())
+
+
+def finish_page(rows: list, order: list, page: PageParams, response: Response) -> list:
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([getattr(last, column.key) for column, _ in order])
+    return rows
+
+
+def paginate(db, statement, order: list, page: PageParams, response: Response) -> list:
+    """Run one keyset-paginated page of an ORM select() statement.
+
+    `order` is a list of (column, descending) pairs that must end with a unique
+    column (normally the primary key) so the ordering is stable. Keyset conditions
+    skip rows whose order columns are NULL, and a row whose order columns change
+    between two fetches can be skipped or repeated; order on immutable, non-null
+    columns where that matters.
+    """
+    if page.include_total:
+        response.headers[TOTAL_COUNT_HEADER] = str(db.scalar(count_statement(statement)))
+    rows = db.scalars(page_statement(statement, order, page)).all()
+    return finish_page(rows, order, page, response)
+
+
+async def paginate_async(db, statement, order: list, page: PageParams, response: Response) -> list:
+    """Same as paginate() for an AsyncSession."""
+    if page.include_total:
+        response.headers[TOTAL_COUNT_HEADER] = str(await db.scalar(count_statement(statement)))
+    rows = (await db.scalars(page_statement(statement, order, page))).all()
+    return finish_page(rows, order, page, response)
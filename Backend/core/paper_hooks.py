@@ -0,0 +1,16 @@
+from Backend.core.response_cache import response_cache
+from Backend.core.search_index import search_index
+from Backend.core.suggestions import suggestion_index
+
+
+# 📌 Keep the in-memory search indexes and cached reads in sync with the table
+def index_paper(paper):
+    search_index.add_paper(paper)
+    suggestion_index.add_paper(paper)
+    response_cache.invalidate("papers", f"paper:{paper.id}")
+
+
+def unindex_paper(paper_id: int):
+    search_index.remove_paper(paper_id)
+    suggestion_index.remove_paper(paper_id)
+    response_cache.invalidate("papers", f"paper:{paper_id}", f"comments:paper:{paper_id}")
@@ -0,0 +1,76 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+from fastapi import HTTPException, status
+
+# Hashing tuning from .env; bcrypt releases the GIL, so threads hash in parallel
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Hash/verify calls allowed to wait or run at once; beyond that requests get a 503 right away
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+PASSWORD_HASH_RETRY_AFTER = os.getenv("PASSWORD_HASH_RETRY_AFTER", "1")
+
+_pool = None
+_pool_lock = threading.Lock()
+_pending = 0
+_pending_lock = threading.Lock()
+
+
+def hash_password(password: str, rounds: int = BCRYPT_ROUNDS) -> str:
+    salt = bcrypt.gensalt(rounds=rounds)
+    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+
+def needs_rehash(hashed_password: str, rounds: int = BCRYPT_ROUNDS) -> bool:
+    """True when the hash was made with a different cost factor than the configured one."""
+    try:
+        return int(hashed_password.split("$")[2]) != rounds
+    except (IndexError, ValueError):
+        return True
+
+
+def get_hash_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+        return _pool
+
+
+def shutdown_hash_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+
+async def _run_limited(function, *args):
+    global _pending
+    with _pending_lock:
+        if _pending >= PASSWORD_HASH_MAX_PENDING:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                                detail="Too many logins in progress, try again shortly",
+                                headers={"Retry-After": PASSWORD_HASH_RETRY_AFTER})
+        _pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(get_hash_pool(), function, *args)
+    finally:
+        with _pending_lock:
+            _pending -= 1
+
+
+# 📌 Hash / verify off the event loop, on the bounded hashing pool
+async def hash_password_async(password: str) -> str:
+    return await _run_limited(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_limited(verify_password, plain_password, hashed_password)
@@ -0,0 +1,97 @@
+import os
+import re
+
+import fitz
+
+from Backend.core.page_text import has_pages, read_pages
+
+# Title, authors and year are only looked for on the first pages
+HEADER_PAGES = int(os.getenv("PDF_HEADER_PAGES", "2"))
+# Give up on the introduction (and the year) if not found within this many pages
+INTRO_SEARCH_PAGES = int(os.getenv("PDF_INTRO_SEARCH_PAGES", "10"))
+# Longest introduction kept, in characters
+INTRO_MAX_CHARS = int(os.getenv("PDF_INTRO_MAX_CHARS", "5000"))
+
+TITLE_PATTERN = re.compile(r"(?m)^[ \t]*(\S.*?)[ \t]*$")
+AUTHOR_PATTERN = re.compile(r"(?m)^\s*(.+?)\n.*\b(?:University|Institute|Department|Faculty)\b")
+YEAR_PATTERN = re.compile(r"\b(19\d{2}|20\d{2})\b")
+INTRO_START_PATTERN = re.compile(r"(?i)\bIntroduction\b")
+INTRO_END_PATTERN = re.compile(r"(?i)\b(?:Methodology|Materials|Related Work|Background)\b")
+
+# Characters re-scanned across a page break so a heading split over it is still found
+PAGE_OVERLAP = 32
+
+
+# 📌 Extract Metadata from the text of a PDF, one page at a time
+def extract_metadata_from_pages(pages) -> dict:
+    """Read page texts lazily and stop as soon as every field is resolved.
+
+    `pages` is any iterable of page texts; pages after the point where all fields
+    are known (or their page limits are reached) are never requested.
+    """
+    title = authors = year = intro = None
+    header = ""  # text of the first HEADER_PAGES pages
+    intro_text = None  # text after the "Introduction" heading, once it was seen
+
+    for page_number, page_text in enumerate(pages):
+        in_header = page_number < HEADER_PAGES
+        if in_header:
+            header = f"{header}\n{page_text}" if header else page_text
+            if title is None and (title_match := TITLE_PATTERN.search(header)):
+                title = title_match.group(1)
+            if authors is None and (author_match := AUTHOR_PATTERN.search(header)):
+                authors = author_match.group(1).strip()
+
+        # Extract Year (Find a 4-digit year like 2020, 2021)
+        if year is None and (year_match := YEAR_PATTERN.search(page_text)):
+            year = year_match.group(1)
+
+        # Extract Introduction (Find text after "Introduction" heading, up to the next section)
+        if intro is None:
+            if intro_text is None and page_number < INTRO_SEARCH_PAGES:
+                if start_match := INTRO_START_PATTERN.search(page_text):
+                    intro_text = page_text[start_match.end():]
+                    scan_from = 0
+            elif intro_text is not None:
+                scan_from = max(0, len(intro_text) - PAGE_OVERLAP)
+                intro_text = f"{intro_text}\n{page_text}"
+            if intro_text is not None:
+                end_match = INTRO_END_PATTERN.search(intro_text, scan_from)
+                if end_match:
+                    intro = intro_text[:end_match.start()].strip()[:INTRO_MAX_CHARS]
+                elif len(intro_text) >= INTRO_MAX_CHARS + PAGE_OVERLAP:
+                    intro = intro_text[:INTRO_MAX_CHARS].strip()
+
+        past_search_pages = page_number + 1 >= INTRO_SEARCH_PAGES
+        header_done = (title is not None and authors is not None) or not in_header
+        year_done = year is not None or past_search_pages
+        intro_done = intro is not None or (intro_text is None and past_search_pages)
+        if header_done and year_done and intro_done:
+            break
+
+    if intro is None and intro_text:
+        intro = intro_text[:INTRO_MAX_CHARS].strip()  # Document ended inside the introduction
+
+    return {
+        "title": title or "Unknown Title",
+        "authors": authors or "Unknown Authors",
+        "year": int(year) if year else None,  # research_papers.year is an Integer; NULL when not found
+        "introduction": intro or "Introduction not found",
+    }
+
+
+def extract_metadata_from_doc(doc) -> dict:
+    """Metadata of an open PyMuPDF document; only the pages it needs are extracted."""
+    return extract_metadata_from_pages(page.get_text("text") for page in doc)
+
+
+# 📌 Function to Extract Metadata from PDF
+def extract_metadata_from_pdf(pdf_path):
+    """Re-extractions read the stored page text instead of parsing the PDF again."""
+    if has_pages(pdf_path):
+        return extract_metadata_from_pages(read_pages(pdf_path))
+    doc = fitz.open(pdf_path)
+    try:
+        return extract_metadata_from_doc(doc)
+    finally:
+        doc.close()
@@ -0,0 +1,88 @@
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+from sqlalchemy import event, inspect
+
+from Backend.models.admin import Admin
+
+# Verified tokens kept per worker; TTL bounds how long another worker's admin change can go unseen
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "4096"))
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "60"))
+
+
+class PrincipalCache:
+    """Bounded cache of verified tokens -> principal dicts.
+
+    An entry expires after `ttl` seconds or at the token's own `exp`, whichever
+    comes first, and all entries of a username are dropped when that admin is
+    updated or deleted through the ORM.
+    """
+
+    def __init__(self, max_entries: int = AUTH_CACHE_MAX_ENTRIES, ttl: float = AUTH_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # token -> (expires_at, username, principal)
+        self._by_username = defaultdict(set)  # username -> tokens
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str):
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    self._drop(token)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry[2]
+
+    def set(self, token: str, username: str, principal: dict, token_expires_at: float = None):
+        expires_at = time.time() + self.ttl
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+        with self._lock:
+            if token in self._entries:
+                self._drop(token)
+            self._entries[token] = (expires_at, username, principal)
+            self._by_username[username].add(token)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, token: str):
+        _, username, _ = self._entries.pop(token)
+        tokens = self._by_username.get(username)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._by_username[username]
+
+    def invalidate_user(self, *usernames: str):
+        with self._lock:
+            for username in usernames:
+                for token in list(self._by_username.get(username, ())):
+                    self._drop(token)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_username.clear()
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Shared cache for this worker process
+principal_cache = PrincipalCache()
+
+
+# Bulk UPDATE/DELETE statements on admins bypass these hooks; use the ORM to change admins
+@event.listens_for(Admin, "after_update")
+@event.listens_for(Admin, "after_delete")
+def _invalidate_admin(mapper, connection, target):
+    history = inspect(target).attrs.username.history
+    principal_cache.invalidate_user(target.username, *history.deleted)
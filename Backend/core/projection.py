@@ -0,0 +1,60 @@
+from fastapi import HTTPException, Query
+from sqlalchemy.orm import load_only, noload, selectinload, with_expression
+
+SUMMARY = "summary"
+FULL = "full"
+
+
+class ProjectionParams:
+    """`view` / `fields` query parameters shared by the read endpoints."""
+
+    def __init__(
+            self,
+            view: str = Query(FULL, pattern=f"^({SUMMARY}|{FULL})$", description="summary skips large columns"),
+            fields: str | None = Query(None, description="Comma-separated fields to return; overrides view"),
+    ):
+        self.view = view
+        self.fields = fields
+
+
+class Projection:
+    """Maps a requested view or field list onto SQL column loading and response dicts.
+
+    Only the selected columns are fetched (everything else is deferred) and
+    relationships that were not asked for are never loaded. `expressions` are
+    SQL-computed fields (mapped with query_expression()) that are only returned
+    when named in `fields`.
+    """
+
+    def __init__(self, model, summary: list[str], full: list[str], relationships: dict = None,
+                 expressions: dict = None):
+        self.model = model
+        self.views = {SUMMARY: summary, FULL: full}
+        self.relationships = relationships or {}  # name -> function serializing the related objects
+        self.expressions = expressions or {}  # name -> SQL expression loaded into that attribute
+
+    def select(self, params: ProjectionParams) -> list[str]:
+        if not params.fields:
+            return self.views[params.view]
+        requested = [field.strip() for field in params.fields.split(",") if field.strip()]
+        unknown = [field for field in requested if field not in self.views[FULL] and field not in self.expressions]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        return ["id"] + [field for field in requested if field != "id"]
+
+    def options(self, selected: list[str], extra_columns: tuple = ()) -> list:
+        """Loader options for the selected fields; `extra_columns` are loaded too (e.g. for ordering)."""
+        columns = [getattr(self.model, field) for field in selected
+                   if field not in self.relationships and field not in self.expressions]
+        options = [load_only(*columns, *extra_columns)]
+        for name in self.relationships:
+            attribute = getattr(self.model, name)
+            options.append(selectinload(attribute) if name in selected else noload(attribute))
+        for name, expression in self.expressions.items():
+            if name in selected:
+                options.append(with_expression(getattr(self.model, name), expression))
+        return options
+
+    def dump(self, obj, selected: list[str]) -> dict:
+        return {field: self.relationships[field](getattr(obj, field)) if field in self.relationships
+                else getattr(obj, field) for field in selected}
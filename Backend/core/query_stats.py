@@ -0,0 +1,178 @@
+import contextvars
+import heapq
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+# Statement history kept for the admin endpoint, and how much of each statement is shown
+QUERY_STATS_HISTORY = int(os.getenv("QUERY_STATS_HISTORY", "500"))
+QUERY_STATS_STATEMENT_CHARS = int(os.getenv("QUERY_STATS_STATEMENT_CHARS", "500"))
+# Requests issuing more queries than this are logged as a likely N+1 (0 = never)
+QUERY_COUNT_WARNING = int(os.getenv("QUERY_COUNT_WARNING", "50"))
+
+# Response headers carrying the per-request numbers
+QUERY_COUNT_HEADER = "X-DB-Queries"
+QUERY_TIME_HEADER = "X-DB-Time-Ms"
+
+
+class TimedPoolMixin:
+    """Counts checkouts, time spent waiting for a free connection and checkout timeouts."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            self.checkouts += 1
+            self.wait_time += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": self.overflow(),
+            "max_overflow": self._max_overflow,
+            "timeout": self._timeout,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": round(self.wait_time / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+        }
+
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class RequestQueryStats:
+    """Queries run while handling one request."""
+
+    __slots__ = ("queries", "db_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+
+# Stats of the request being handled; shared with the threadpool and with AsyncSession greenlets
+_current_request = contextvars.ContextVar("query_stats_request", default=None)
+_current_path = contextvars.ContextVar("query_stats_path", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_stats_start", []).append(time.perf_counter())
+
+
+def _handle_error(exception_context):
+    """A failed statement never reaches after_cursor_execute; drop its start time from the connection."""
+    conn = exception_context.connection
+    if conn is None or exception_context.execution_context is None:
+        return  # Not a statement execution (e.g. connecting)
+    started = conn.info.get("query_stats_start")
+    if started:
+        started.pop()
+
+
+class QueryStats:
+    """Process-wide statement timings fed by engine events.
+
+    Keeps totals and the last `history` statements so the slowest recent ones can
+    be listed; each statement is also added to the current request's counters.
+    """
+
+    def __init__(self, history: int = QUERY_STATS_HISTORY):
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=history)  # (seconds, statement, path, finished_at)
+        self.queries = 0
+        self.db_time = 0.0
+        self.requests = 0
+        self.heavy_requests = 0
+
+    def instrument(self, engine):
+        """Attach the timing hooks to a sync Engine (use `async_engine.sync_engine` for async ones)."""
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("query_stats_start")
+        if not started:
+            return
+        elapsed = time.perf_counter() - started.pop()
+        request = _current_request.get()
+        if request is not None:
+            request.queries += 1
+            request.db_time += elapsed
+        path = _current_path.get()
+        with self._lock:
+            self.queries += 1
+            self.db_time += elapsed
+            self._recent.append((elapsed, statement[:QUERY_STATS_STATEMENT_CHARS], path, time.time()))
+
+    def slowest(self, limit: int = 20) -> list:
+        with self._lock:
+            recent = list(self._recent)
+        return [
+            {"duration_ms": round(elapsed * 1000, 3), "statement": statement, "path": path, "finished_at": finished_at}
+            for elapsed, statement, path, finished_at in heapq.nlargest(limit, recent, key=lambda item: item[0])
+        ]
+
+    def finish_request(self, method: str, path: str, request: RequestQueryStats):
+        with self._lock:
+            self.requests += 1
+            if QUERY_COUNT_WARNING and request.queries > QUERY_COUNT_WARNING:
+                self.heavy_requests += 1
+                logger.warning("%s %s ran %d queries (%.1f ms)", method, path, request.queries,
+                               request.db_time * 1000)
+
+    def stats(self) -> dict:
+        return {
+            "queries": self.queries,
+            "db_time_ms": round(self.db_time * 1000, 3),
+            "requests": self.requests,
+            "heavy_requests": self.heavy_requests,
+        }
+
+
+# Shared statistics for this worker process
+query_stats = QueryStats()
+
+
+async def query_stats_middleware(request, call_next):
+    """Count the queries of each request and report them in response headers."""
+    stats = RequestQueryStats()
+    request_token = _current_request.set(stats)
+    path_token = _current_path.set(request.url.path)
+    try:
+        response = await call_next(request)
+    finally:
+        _current_request.reset(request_token)
+        _current_path.reset(path_token)
+    query_stats.finish_request(request.method, request.url.path, stats)
+    response.headers[QUERY_COUNT_HEADER] = str(stats.queries)
+    response.headers[QUERY_TIME_HEADER] = f"{stats.db_time * 1000:.1f}"
+    return response
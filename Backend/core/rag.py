@@ -0,0 +1,153 @@
+import asyncio
+import itertools
+import logging
+import os
+import threading
+
+from decouple import config
+from starlette.concurrency import run_in_threadpool
+
+from Backend.core.storage import UPLOAD_DIR
+
+logger = logging.getLogger(__name__)
+
+# RAG backends from .env. Nothing is imported or connected until first use (or warm_up()).
+RAG_VECTOR_BACKEND = os.getenv("RAG_VECTOR_BACKEND", "remote").lower()  # "remote" (QDRANT_URL), "memory" or "path"
+QDRANT_PATH = os.getenv("QDRANT_PATH", os.path.join(UPLOAD_DIR, "qdrant"))  # On-disk local mode, for "path"
+QDRANT_TIMEOUT = int(os.getenv("QDRANT_TIMEOUT", "5"))  # Seconds per request to a remote Qdrant
+RAG_EMBEDDINGS = os.getenv("RAG_EMBEDDINGS", "openai").lower()  # "openai", or "fake" (deterministic, offline)
+RAG_EMBEDDING_SIZE = int(os.getenv("RAG_EMBEDDING_SIZE", "1536"))  # Vector size of the collection (and fake embeddings)
+RAG_CHAT_MODEL = os.getenv("RAG_CHAT_MODEL", "openai").lower()  # "openai", or "fake" (canned answer, offline)
+RAG_WARM_UP = os.getenv("RAG_WARM_UP", "0").lower() in ("1", "true", "yes")  # Create everything at startup
+RAG_INIT_TIMEOUT = float(os.getenv("RAG_INIT_TIMEOUT", "15"))  # Seconds the startup warm-up may take
+
+COLLECTION_NAME = "WebSites"
+FAKE_ANSWER = "This is a placeholder answer from the fake chat model."
+
+
+def create_client():
+    from qdrant_client import QdrantClient
+
+    if RAG_VECTOR_BACKEND == "memory":
+        return QdrantClient(location=":memory:")
+    if RAG_VECTOR_BACKEND == "path":
+        return QdrantClient(path=QDRANT_PATH)
+    if RAG_VECTOR_BACKEND != "remote":
+        raise ValueError(f"Unknown RAG_VECTOR_BACKEND: {RAG_VECTOR_BACKEND!r}")
+    return QdrantClient(url=config("QDRANT_URL"), api_key=config("QDRANT_API_KEY"), timeout=QDRANT_TIMEOUT)
+
+
+def create_collection_if_not_exists(client, collection_name: str, size: int):
+    from qdrant_client import models
+
+    if client.collection_exists(collection_name):
+        print(f"Collection {collection_name} already exists.")
+        return
+    print(f"Collection {collection_name} does not exist. Creating now...")
+    client.create_collection(
+        collection_name=collection_name,
+        vectors_config=models.VectorParams(size=size, distance=models.Distance.COSINE)
+    )
+    print(f"Collection {collection_name} created successfully")
+
+
+def create_embeddings():
+    """Embeddings behind the persistent cache, so unchanged chunks are never embedded twice."""
+    from Backend.core.embedding_cache import CachedEmbeddings, EmbeddingStore
+
+    if RAG_EMBEDDINGS == "fake":
+        from langchain_core.embeddings import DeterministicFakeEmbedding
+        return CachedEmbeddings(DeterministicFakeEmbedding(size=RAG_EMBEDDING_SIZE), EmbeddingStore(),
+                                model=f"fake-{RAG_EMBEDDING_SIZE}")
+    if RAG_EMBEDDINGS != "openai":
+        raise ValueError(f"Unknown RAG_EMBEDDINGS: {RAG_EMBEDDINGS!r}")
+    from langchain_openai import OpenAIEmbeddings
+    return CachedEmbeddings(OpenAIEmbeddings(api_key=os.getenv("OPENAI_API_KEY")), EmbeddingStore())
+
+
+def create_chat_model():
+    if RAG_CHAT_MODEL == "fake":
+        from langchain_core.language_models import GenericFakeChatModel
+        from langchain_core.messages import AIMessage
+        return GenericFakeChatModel(messages=itertools.cycle([AIMessage(content=FAKE_ANSWER)]))
+    if RAG_CHAT_MODEL != "openai":
+        raise ValueError(f"Unknown RAG_CHAT_MODEL: {RAG_CHAT_MODEL!r}")
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(model_name="gpt-4-turbo-preview", openai_api_key=config("OPENAI_API_KEY"), temperature=0)
+
+
+class RagStack:
+    """The RAG resources of a worker, each created once, on first use.
+
+    The backends are built in (`client`, `embeddings`, `vector_store`, `model`);
+    anything derived from them (chains, the indexer) is created through
+    `get(name, factory)`. A factory that fails is retried on the next use, so an
+    unreachable Qdrant fails the requests that need it instead of the app's startup.
+    """
+
+    def __init__(self, collection_name: str = COLLECTION_NAME):
+        self.collection_name = collection_name
+        self._lock = threading.RLock()  # Factories may create the resources they depend on
+        self._resources = {}
+        self._factories = {
+            "client": create_client,
+            "embeddings": create_embeddings,
+            "model": create_chat_model,
+            "vector_store": self._create_vector_store,
+        }
+
+    def get(self, name: str, factory=None):
+        resource = self._resources.get(name)
+        if resource is None:
+            with self._lock:
+                resource = self._resources.get(name)
+                if resource is None:
+                    resource = self._resources[name] = (factory or self._factories[name])()
+        return resource
+
+    def loaded(self, name: str):
+        """The resource if it has been created, else None; never creates it."""
+        return self._resources.get(name)
+
+    async def aget(self, name: str, factory=None):
+        """get() for handlers: a resource that still has to be created is created in the threadpool."""
+        resource = self._resources.get(name)
+        return resource if resource is not None else await run_in_threadpool(self.get, name, factory)
+
+    @property
+    def client(self):
+        return self.get("client")
+
+    @property
+    def embeddings(self):
+        return self.get("embeddings")
+
+    @property
+    def model(self):
+        return self.get("model")
+
+    @property
+    def vector_store(self):
+        return self.get("vector_store")
+
+    def _create_vector_store(self):
+        from langchain_qdrant import QdrantVectorStore
+
+        # Ensure the collection exists before any operation
+        create_collection_if_not_exists(self.client, self.collection_name, RAG_EMBEDDING_SIZE)
+        return QdrantVectorStore(client=self.client, collection_name=self.collection_name, embedding=self.embeddings)
+
+    def warm_up(self):
+        for name in self._factories:
+            self.get(name)
+
+    async def start(self, timeout: float = RAG_INIT_TIMEOUT):
+        """Create the resources at startup; failures and timeouts are logged and left to first use."""
+        try:
+            await asyncio.wait_for(run_in_threadpool(self.warm_up), timeout)
+        except Exception as e:
+            logger.warning("RAG warm-up failed, resources will be created on first use: %s",
+                           str(e) or e.__class__.__name__)
+
+
+rag = RagStack()
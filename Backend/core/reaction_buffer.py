@@ -0,0 +1,122 @@
+import logging
+import os
+import threading
+
+from sqlalchemy import bindparam, update
+
+from Backend.core.database import SessionLocal
+from Backend.core.response_cache import response_cache
+from Backend.models.comment import Comment
+
+logger = logging.getLogger(__name__)
+
+# Coalesce likes/dislikes in memory instead of one UPDATE per click (off by default)
+REACTION_BUFFER_ENABLED = os.getenv("REACTION_BUFFER", "0").lower() in ("1", "true", "yes")
+REACTION_FLUSH_INTERVAL = float(os.getenv("REACTION_FLUSH_INTERVAL", "1.0"))
+# Flush early once this many different comments have pending reactions
+REACTION_MAX_PENDING = int(os.getenv("REACTION_MAX_PENDING", "1000"))
+
+comments_table = Comment.__table__
+
+# One statement per flush, executed for every comment with pending reactions
+ADD_REACTIONS = (
+    update(comments_table)
+    .where(comments_table.c.id == bindparam("comment_id"))
+    .values(likes=comments_table.c.likes + bindparam("add_likes"),
+            dislikes=comments_table.c.dislikes + bindparam("add_dislikes"))
+)
+
+
+class ReactionBuffer:
+    """Aggregates comment likes/dislikes and applies them in periodic batches.
+
+    A burst of reactions on one comment becomes a single `likes = likes + n`
+    UPDATE per flush instead of n serialized transactions on the same row.
+    """
+
+    def __init__(self, session_factory=SessionLocal, flush_interval: float = REACTION_FLUSH_INTERVAL,
+                 max_pending: int = REACTION_MAX_PENDING):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending = {}  # comment_id -> [paper_id, likes, dislikes]
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="reaction-flusher", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the flusher and write out every pending reaction."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def add(self, comment_id: int, paper_id: int, likes: int = 0, dislikes: int = 0) -> tuple[int, int]:
+        """Record reactions and return the (likes, dislikes) still pending for the comment."""
+        self.start()
+        with self._lock:
+            entry = self._pending.setdefault(comment_id, [paper_id, 0, 0])
+            entry[1] += likes
+            entry[2] += dislikes
+            pending = entry[1], entry[2]
+            full = len(self._pending) >= self.max_pending
+        if full:
+            self._wake.set()
+        return pending
+
+    def discard(self, comment_id: int):
+        with self._lock:
+            self._pending.pop(comment_id, None)
+
+    def _restore(self, batch: dict):
+        with self._lock:
+            for comment_id, (paper_id, likes, dislikes) in batch.items():
+                entry = self._pending.setdefault(comment_id, [paper_id, 0, 0])
+                entry[1] += likes
+                entry[2] += dislikes
+
+    def flush(self):
+        """Synchronously apply every pending reaction."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return
+            db = self.session_factory()
+            try:
+                db.connection().execute(ADD_REACTIONS, [
+                    {"comment_id": comment_id, "add_likes": likes, "add_dislikes": dislikes}
+                    for comment_id, (_, likes, dislikes) in batch.items()
+                ])
+                db.commit()
+            except Exception:
+                db.rollback()
+                self._restore(batch)  # Retried on the next flush
+                logger.exception("Failed to apply reactions for %d comments", len(batch))
+                return
+            finally:
+                db.close()
+            response_cache.invalidate(*{f"comments:paper:{paper_id}" for paper_id, _, _ in batch.values()})
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+
+# Shared buffer for this worker process
+reaction_buffer = ReactionBuffer()
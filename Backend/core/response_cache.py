@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+# Cache sizing from .env
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2048"))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "300"))
+
+# Headers produced by a handler that are cached along with the body
+CACHED_HEADERS = ("x-next-cursor", "x-total-count")
+
+
+class ResponseCache:
+    """Bounded LRU + TTL cache of serialized GET responses.
+
+    Every entry carries tags (e.g. "papers", "paper:7"); write handlers invalidate
+    tags so the next read is rebuilt from the database. A response built across an
+    invalidation of one of its tags is not stored: `begin_build(tags)` returns the
+    tags' generations, which invalidate() bumps, and `set()` compares them;
+    generations are only kept while a build of the tag is running. Each worker
+    process has its own cache and invalidations only reach that worker: with
+    several workers, the others keep serving their entries until `ttl` expires.
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES, ttl: float = RESPONSE_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, tags, body, etag, headers)
+        self._tagged = defaultdict(set)  # tag -> keys
+        self._generations = {}  # tag -> invalidations since builds of it started (only while some run)
+        self._building = Counter()  # tag -> builds in progress
+        self._cleared = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2:]
+
+    def _generation(self, tags) -> tuple:
+        return (self._cleared, *(self._generations.get(tag, 0) for tag in tags))
+
+    def begin_build(self, tags) -> tuple:
+        """Start building a response for `tags`; pair with end_build() once it is stored or failed."""
+        with self._lock:
+            self._building.update(tags)
+            return self._generation(tags)
+
+    def end_build(self, tags):
+        with self._lock:
+            self._building.subtract(tags)
+            for tag in tags:
+                if self._building[tag] <= 0:
+                    del self._building[tag]
+                    self._generations.pop(tag, None)  # Nobody holds a generation of it any more
+
+    def set(self, key, tags, body: bytes, etag: str, headers: dict, generation: tuple = None):
+        with self._lock:
+            if generation is not None and generation != self._generation(tags):
+                return  # Invalidated while this response was being built
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl, tags, body, etag, headers)
+            for tag in tags:
+                self._tagged[tag].add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, key):
+        _, tags, *_ = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tagged[tag]
+
+    def invalidate(self, *tags: str):
+        with self._lock:
+            for tag in tags:
+                if tag in self._building:
+                    self._generations[tag] = self._generations.get(tag, 0) + 1
+                for key in list(self._tagged.get(tag, ())):
+                    self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tagged.clear()
+            self._cleared += 1
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Shared cache for this worker process
+response_cache = ResponseCache()
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [candidate.strip().removeprefix("W/") for candidate in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _cache_key(request: Request):
+    return request.url.path, tuple(sorted(request.query_params.multi_items()))
+
+
+def _store(key, tags: tuple, generation: tuple, content, scratch: Response):
+    body = json.dumps(jsonable_encoder(content), separators=(",", ":")).encode()
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    headers = {name: value for name, value in scratch.headers.items() if name in CACHED_HEADERS}
+    response_cache.set(key, tags, body, etag, headers, generation=generation)
+    return body, etag, headers
+
+
+def _reply(request: Request, body: bytes, etag: str, headers: dict) -> Response:
+    headers = {**headers, "ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def cached_json(request: Request, tags: tuple, build) -> Response:
+    """Serve a GET from the cache, building and caching it on a miss.
+
+    `build(response)` returns the JSON-able content; headers it sets on `response`
+    (pagination) are cached with the body. The reply carries a strong ETag over
+    the body, and a matching If-None-Match gets an empty 304.
+    """
+    key = _cache_key(request)
+    cached = response_cache.get(key)
+    if cached is None:
+        scratch = Response()
+        generation = response_cache.begin_build(tags)
+        try:
+            cached = _store(key, tags, generation, build(scratch), scratch)
+        finally:
+            response_cache.end_build(tags)
+    return _reply(request, *cached)
+
+
+async def cached_json_async(request: Request, tags: tuple, build) -> Response:
+    """Same as cached_json() for an async `build(response)`."""
+    key = _cache_key(request)
+    cached = response_cache.get(key)
+    if cached is None:
+        scratch = Response()
+        generation = response_cache.begin_build(tags)
+        try:
+            cached = _store(key, tags, generation, await build(scratch), scratch)
+        finally:
+            response_cache.end_build(tags)
+    return _reply(request, *cached)
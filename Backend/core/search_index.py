@@ -0,0 +1,213 @@
+import bisect
+import heapq
+import math
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+
+from Backend.core.page_text import has_pages, read_pages
+from Backend.models.research_papers import ResearchPaper
+
+# Field boosts used when turning a paper into weighted term frequencies
+FIELD_BOOSTS = {
+    "title": 3.0,
+    "author": 2.0,
+    "year": 1.0,
+    "introduction": 1.0,
+}
+
+# Body text from the page text store is indexed too when this boost is above 0 (off by default)
+SEARCH_BODY_BOOST = float(os.getenv("SEARCH_BODY_BOOST", "0"))
+# Only the first characters of the body are indexed, to bound memory per paper
+SEARCH_BODY_MAX_CHARS = int(os.getenv("SEARCH_BODY_MAX_CHARS", "50000"))
+# Seconds after which the search and suggestion indexes are rebuilt from the table on the next
+# read, picking up writes made by other workers or processes; 0 never rebuilds (single worker only)
+SEARCH_INDEX_REFRESH = float(os.getenv("SEARCH_INDEX_REFRESH", "60"))
+
+# BM25 tuning parameters
+K1 = 1.2
+B = 0.75
+
+# Only the last query token is prefix-expanded, and only into this many terms
+MAX_PREFIX_EXPANSIONS = 50
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOP_WORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "of", "on", "or", "that", "the", "this", "to", "was", "were", "with",
+})
+
+
+def tokenize(text) -> list[str]:
+    if text is None:
+        return []
+    return [token for token in TOKEN_PATTERN.findall(str(text).lower()) if token not in STOP_WORDS]
+
+
+def body_text(paper) -> str | None:
+    """Leading SEARCH_BODY_MAX_CHARS characters of the paper's stored page text, if extracted."""
+    file_path = getattr(paper, "file_path", None)
+    if not file_path or not has_pages(file_path):
+        return None
+    parts, size = [], 0
+    for text in read_pages(file_path):
+        parts.append(text)
+        size += len(text)
+        if size >= SEARCH_BODY_MAX_CHARS:
+            break
+    return "\n".join(parts)[:SEARCH_BODY_MAX_CHARS]
+
+
+class SearchIndex:
+    """In-memory inverted index over research papers with BM25 ranking.
+
+    Each paper is stored as a bag of field-weighted term frequencies, so a hit in the
+    title counts more than a hit in the introduction. The index lives in the worker
+    process and is kept in sync by the paper write handlers of that worker; writes
+    made elsewhere are picked up when it is rebuilt, `refresh_interval` seconds after
+    the last build.
+    """
+
+    def __init__(self, refresh_interval: float = SEARCH_INDEX_REFRESH):
+        self.refresh_interval = refresh_interval
+        self._lock = threading.RLock()
+        self._built = False
+        self._built_at = 0.0
+        self._postings = defaultdict(dict)  # term -> {paper_id: weighted tf}
+        self._doc_terms = {}  # paper_id -> {term: weighted tf}
+        self._doc_lengths = {}  # paper_id -> weighted length
+        self._total_length = 0.0
+        self._vocabulary = []  # sorted terms, for prefix expansion
+
+    @property
+    def built(self) -> bool:
+        return self._built
+
+    def __len__(self):
+        return len(self._doc_terms)
+
+    def _weighted_terms(self, paper) -> dict[str, float]:
+        terms = defaultdict(float)
+        for field, boost in FIELD_BOOSTS.items():
+            for token in tokenize(getattr(paper, field, None)):
+                terms[token] += boost
+        if SEARCH_BODY_BOOST > 0:
+            for token in tokenize(body_text(paper)):
+                terms[token] += SEARCH_BODY_BOOST
+        return terms
+
+    def build(self, db, batch_size: int = 1000):
+        """(Re)build the whole index from the research_papers table."""
+        with self._lock:
+            self._postings.clear()
+            self._doc_terms.clear()
+            self._doc_lengths.clear()
+            self._total_length = 0.0
+            self._vocabulary = []
+
+            papers = db.query(
+                ResearchPaper.id, ResearchPaper.title, ResearchPaper.author,
+                ResearchPaper.year, ResearchPaper.introduction, ResearchPaper.file_path
+            ).yield_per(batch_size)
+            for paper in papers:
+                self._add(paper.id, self._weighted_terms(paper), update_vocabulary=False)
+
+            self._vocabulary = sorted(self._postings)
+            self._built = True
+            self._built_at = time.monotonic()
+
+    def _current(self) -> bool:
+        return self._built and (self.refresh_interval <= 0
+                                or time.monotonic() - self._built_at < self.refresh_interval)
+
+    def ensure_built(self, db):
+        """Build the index on first use, and rebuild it once it is older than `refresh_interval`."""
+        if not self._current():
+            with self._lock:
+                if not self._current():
+                    self.build(db)
+
+    def _add(self, paper_id: int, terms: dict[str, float], update_vocabulary: bool = True):
+        self._remove(paper_id)
+        length = sum(terms.values())
+        for term, weight in terms.items():
+            postings = self._postings[term]
+            if update_vocabulary and not postings:
+                bisect.insort(self._vocabulary, term)
+            postings[paper_id] = weight
+        self._doc_terms[paper_id] = terms
+        self._doc_lengths[paper_id] = length
+        self._total_length += length
+
+    def _remove(self, paper_id: int):
+        terms = self._doc_terms.pop(paper_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(paper_id, None)
+            if not postings:
+                del self._postings[term]
+                position = bisect.bisect_left(self._vocabulary, term)
+                if position < len(self._vocabulary) and self._vocabulary[position] == term:
+                    del self._vocabulary[position]
+        self._total_length -= self._doc_lengths.pop(paper_id, 0.0)
+
+    def add_paper(self, paper):
+        """Index a new paper or replace the entry of an updated one."""
+        with self._lock:
+            if self._built:
+                self._add(paper.id, self._weighted_terms(paper))
+
+    def remove_paper(self, paper_id: int):
+        with self._lock:
+            if self._built:
+                self._remove(paper_id)
+
+    def _expand_prefix(self, prefix: str) -> list[str]:
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        expanded = []
+        for term in self._vocabulary[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(prefix):
+                break
+            expanded.append(term)
+        return expanded
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> tuple[list[tuple[int, float]], int]:
+        """Return one page of (paper_id, score) pairs, best first, and the total hit count."""
+        tokens = tokenize(query)
+        if not tokens:
+            return [], 0
+
+        with self._lock:
+            doc_count = len(self._doc_terms)
+            if doc_count == 0:
+                return [], 0
+            average_length = self._total_length / doc_count
+
+            # The last token may still be being typed, so let it match as a prefix too
+            query_terms = {token: 1.0 for token in tokens}
+            for term in self._expand_prefix(tokens[-1]):
+                query_terms.setdefault(term, 0.5)
+
+            scores = defaultdict(float)
+            for term, query_weight in query_terms.items():
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for paper_id, tf in postings.items():
+                    norm = K1 * (1 - B + B * self._doc_lengths[paper_id] / average_length)
+                    scores[paper_id] += query_weight * idf * tf * (K1 + 1) / (tf + norm)
+
+        top = heapq.nlargest(offset + limit, scores.items(), key=lambda item: (item[1], -item[0]))
+        return top[offset:], len(scores)
+
+
+# Shared index for this worker process
+search_index = SearchIndex()
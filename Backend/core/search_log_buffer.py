@@ -0,0 +1,152 @@
+import logging
+import os
+import queue
+import threading
+import time
+
+from sqlalchemy import insert
+
+from Backend.core.database import SessionLocal
+from Backend.core.trending import trending_topics
+from Backend.models.search_logs import SearchLog
+
+logger = logging.getLogger(__name__)
+
+# Buffer tuning from .env
+SEARCH_LOG_QUEUE_SIZE = int(os.getenv("SEARCH_LOG_QUEUE_SIZE", "10000"))
+SEARCH_LOG_BATCH_SIZE = int(os.getenv("SEARCH_LOG_BATCH_SIZE", "200"))
+SEARCH_LOG_FLUSH_INTERVAL = float(os.getenv("SEARCH_LOG_FLUSH_INTERVAL", "2.0"))
+# How long a search may wait for room in a full queue before its log is dropped (0 = drop at once)
+SEARCH_LOG_ENQUEUE_TIMEOUT = float(os.getenv("SEARCH_LOG_ENQUEUE_TIMEOUT", "0"))
+
+
+class SearchLogBuffer:
+    """Write-behind buffer for search_logs rows.
+
+    Searches enqueue a row and return; a background thread bulk-inserts the rows in
+    batches whenever `batch_size` rows are waiting or `flush_interval` seconds have
+    passed. When the queue is full the row is dropped rather than slowing the search.
+    `on_flush(rows)` is called with every batch once it is committed.
+    """
+
+    def __init__(self, session_factory=SessionLocal, max_size: int = SEARCH_LOG_QUEUE_SIZE,
+                 batch_size: int = SEARCH_LOG_BATCH_SIZE, flush_interval: float = SEARCH_LOG_FLUSH_INTERVAL,
+                 enqueue_timeout: float = SEARCH_LOG_ENQUEUE_TIMEOUT, on_flush=None):
+        self.session_factory = session_factory
+        self.on_flush = on_flush
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self._queue = queue.Queue(maxsize=max_size)
+        self._stop = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._counter_lock = threading.Lock()
+        self.enqueued = 0
+        self.dropped = 0
+        self.flushed = 0
+        self.failed = 0
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="search-log-flusher", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the flusher and write out everything still queued."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def enqueue(self, keyword: str, found_in_db: bool, date_searched) -> bool:
+        self.start()
+        row = {"keyword": keyword, "found_in_db": found_in_db, "date_searched": date_searched}
+        try:
+            if self.enqueue_timeout > 0:
+                self._queue.put(row, timeout=self.enqueue_timeout)
+            else:
+                self._queue.put_nowait(row)
+        except queue.Full:
+            with self._counter_lock:
+                self.dropped += 1
+            return False
+        with self._counter_lock:
+            self.enqueued += 1
+        return True
+
+    def _drain(self, limit: int) -> list[dict]:
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: list[dict]):
+        if not batch:
+            return
+        db = self.session_factory()
+        try:
+            db.execute(insert(SearchLog), batch)
+            db.commit()
+        except Exception:
+            db.rollback()
+            with self._counter_lock:
+                self.failed += len(batch)
+            logger.exception("Failed to write %d buffered search logs", len(batch))
+            return
+        finally:
+            db.close()
+        with self._counter_lock:
+            self.flushed += len(batch)
+        if self.on_flush:
+            try:
+                self.on_flush(batch)
+            except Exception:
+                logger.exception("on_flush failed for %d search logs", len(batch))
+
+    def flush(self):
+        """Synchronously write every queued row."""
+        with self._flush_lock:
+            while True:
+                batch = self._drain(self.batch_size)
+                if not batch:
+                    return
+                self._write(batch)
+
+    def _run(self):
+        while not self._stop.is_set():
+            deadline = time.monotonic() + self.flush_interval
+            batch = []
+            while len(batch) < self.batch_size and not self._stop.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=min(remaining, 0.5)))
+                except queue.Empty:
+                    continue
+                batch.extend(self._drain(self.batch_size - len(batch)))
+            with self._flush_lock:
+                self._write(batch)
+
+    def stats(self) -> dict:
+        with self._counter_lock:
+            return {
+                "queued": self._queue.qsize(),
+                "enqueued": self.enqueued,
+                "flushed": self.flushed,
+                "dropped": self.dropped,
+                "failed": self.failed,
+            }
+
+
+# Shared buffer for this worker process
+search_log_buffer = SearchLogBuffer(on_flush=trending_topics.record_logs)  # Trending counts only written searches
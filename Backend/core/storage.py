@@ -0,0 +1,108 @@
+import hashlib
+import os
+import tempfile
+import zipfile
+from collections import namedtuple
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+# Upload storage settings from .env
+UPLOAD_DIR = "uploads"
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(50 * 1024 * 1024)))
+MAX_BATCH_FILES = int(os.getenv("MAX_BATCH_FILES", "1000"))
+
+os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+# Where a stored upload ended up; `created` is False when identical bytes were already stored
+StoredFile = namedtuple("StoredFile", ["path", "sha256", "size", "created"])
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+def content_path(sha256: str, suffix: str = ".pdf") -> str:
+    return os.path.join(UPLOAD_DIR, f"{sha256}{suffix}")
+
+
+class ContentWriter:
+    """Writes a file chunk by chunk while hashing it, then files it under its SHA-256.
+
+    Byte-identical uploads map to the same path, so each distinct PDF is stored once.
+    """
+
+    def __init__(self, max_bytes: int = MAX_UPLOAD_BYTES, suffix: str = ".pdf"):
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._file = tempfile.NamedTemporaryFile(dir=UPLOAD_DIR, suffix=".part", delete=False)
+
+    def write(self, chunk: bytes):
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            self.discard()
+            raise UploadTooLarge(f"File exceeds the {self.max_bytes} byte upload limit")
+        self._hash.update(chunk)
+        self._file.write(chunk)
+
+    def commit(self) -> StoredFile:
+        self._file.close()
+        sha256 = self._hash.hexdigest()
+        path = content_path(sha256, self.suffix)
+        if os.path.exists(path):
+            os.remove(self._file.name)
+            return StoredFile(path, sha256, self.size, False)
+        os.replace(self._file.name, path)
+        return StoredFile(path, sha256, self.size, True)
+
+    def discard(self):
+        self._file.close()
+        if os.path.exists(self._file.name):
+            os.remove(self._file.name)
+
+
+def store_fileobj(fileobj, max_bytes: int = MAX_UPLOAD_BYTES) -> StoredFile:
+    """Stream a binary file object into content-addressed storage."""
+    writer = ContentWriter(max_bytes)
+    try:
+        while chunk := fileobj.read(UPLOAD_CHUNK_SIZE):
+            writer.write(chunk)
+    except BaseException:
+        writer.discard()
+        raise
+    return writer.commit()
+
+
+async def store_upload(file: UploadFile, max_bytes: int = MAX_UPLOAD_BYTES) -> StoredFile:
+    """Stream an UploadFile into content-addressed storage without buffering it in memory."""
+    writer = ContentWriter(max_bytes)
+    try:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            await run_in_threadpool(writer.write, chunk)
+    except BaseException:
+        writer.discard()
+        raise
+    return await run_in_threadpool(writer.commit)
+
+
+def store_zip_members(fileobj, max_bytes: int = MAX_UPLOAD_BYTES, max_files: int = MAX_BATCH_FILES) -> list[dict]:
+    """Store every PDF inside a ZIP archive; each member is streamed and size-capped on its own."""
+    items = []
+    with zipfile.ZipFile(fileobj) as archive:
+        members = [member for member in archive.infolist()
+                   if not member.is_dir() and member.filename.lower().endswith(".pdf")
+                   and not os.path.basename(member.filename).startswith(".")]
+        for member in members[:max_files]:
+            item = {"filename": member.filename}
+            try:
+                with archive.open(member) as source:
+                    item["stored"] = store_fileobj(source, max_bytes)
+            except (UploadTooLarge, zipfile.BadZipFile, OSError) as e:
+                item["error"] = str(e)
+            items.append(item)
+        for member in members[max_files:]:
+            items.append({"filename": member.filename, "error": f"Batch is limited to {max_files} files"})
+    return items
@@ -0,0 +1,171 @@
+import heapq
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+
+from fuzzywuzzy import fuzz
+
+from Backend.core.search_index import SEARCH_INDEX_REFRESH, STOP_WORDS
+from Backend.models.research_papers import ResearchPaper
+
+# Candidates taken from the trigram index before the (more expensive) fuzzy re-scoring
+MAX_CANDIDATES = 50
+
+# Trigrams shared by more than this share of all phrases carry little signal and are skipped
+COMMON_TRIGRAM_RATIO = 0.2
+
+# Key phrases kept per paper introduction
+KEY_PHRASES_PER_PAPER = 5
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+AUTHOR_SEPARATOR = re.compile(r",|;|\band\b|&", re.IGNORECASE)
+
+
+def normalize(text: str) -> str:
+    return " ".join(WORD_PATTERN.findall(text.lower()))
+
+
+def trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def extract_key_phrases(text, limit: int = KEY_PHRASES_PER_PAPER) -> list[str]:
+    """Pick the most repeated two-word phrases (falling back to long words) of a text."""
+    if not text:
+        return []
+    words = [word for word in WORD_PATTERN.findall(text.lower()) if word not in STOP_WORDS and not word.isdigit()]
+    bigrams = Counter(f"{first} {second}" for first, second in zip(words, words[1:]))
+    phrases = [phrase for phrase, count in bigrams.most_common(limit) if count > 1]
+    if len(phrases) < limit:
+        long_words = Counter(word for word in words if len(word) >= 6)
+        phrases += [word for word, _ in long_words.most_common(limit - len(phrases))]
+    return phrases
+
+
+def paper_phrases(paper) -> set[str]:
+    phrases = set()
+    if paper.title:
+        phrases.add(paper.title.strip())
+    if paper.author:
+        phrases.update(name.strip() for name in AUTHOR_SEPARATOR.split(paper.author) if name.strip())
+    phrases.update(extract_key_phrases(paper.introduction))
+    return phrases
+
+
+class SuggestionIndex:
+    """Trigram index of titles, author names and key phrases for "did you mean" suggestions.
+
+    Candidates are found by counting shared trigrams, and only the best few are
+    re-scored with fuzzywuzzy, so a miss never scans the whole corpus or the database.
+    Like the search index it is per worker, and rebuilt `refresh_interval` seconds after
+    the last build to pick up writes made by other workers.
+    """
+
+    def __init__(self, refresh_interval: float = SEARCH_INDEX_REFRESH):
+        self.refresh_interval = refresh_interval
+        self._lock = threading.RLock()
+        self._built = False
+        self._built_at = 0.0
+        self._phrases = {}  # normalized phrase -> display text
+        self._phrase_papers = defaultdict(set)  # normalized phrase -> paper ids using it
+        self._paper_phrases = {}  # paper id -> normalized phrases
+        self._trigrams = defaultdict(set)  # trigram -> normalized phrases
+
+    @property
+    def built(self) -> bool:
+        return self._built
+
+    def build(self, db, batch_size: int = 1000):
+        with self._lock:
+            self._phrases.clear()
+            self._phrase_papers.clear()
+            self._paper_phrases.clear()
+            self._trigrams.clear()
+
+            papers = db.query(
+                ResearchPaper.id, ResearchPaper.title, ResearchPaper.author, ResearchPaper.introduction
+            ).yield_per(batch_size)
+            for paper in papers:
+                self._add(paper.id, paper_phrases(paper))
+            self._built = True
+            self._built_at = time.monotonic()
+
+    def _current(self) -> bool:
+        return self._built and (self.refresh_interval <= 0
+                                or time.monotonic() - self._built_at < self.refresh_interval)
+
+    def ensure_built(self, db):
+        if not self._current():
+            with self._lock:
+                if not self._current():
+                    self.build(db)
+
+    def _add(self, paper_id: int, phrases: set[str]):
+        self._remove(paper_id)
+        keys = set()
+        for phrase in phrases:
+            key = normalize(phrase)
+            if not key:
+                continue
+            keys.add(key)
+            if key not in self._phrases:
+                self._phrases[key] = phrase
+                for trigram in trigrams(key):
+                    self._trigrams[trigram].add(key)
+            self._phrase_papers[key].add(paper_id)
+        self._paper_phrases[paper_id] = keys
+
+    def _remove(self, paper_id: int):
+        for key in self._paper_phrases.pop(paper_id, ()):
+            papers = self._phrase_papers.get(key)
+            if papers is None:
+                continue
+            papers.discard(paper_id)
+            if papers:
+                continue
+            del self._phrase_papers[key]
+            del self._phrases[key]
+            for trigram in trigrams(key):
+                bucket = self._trigrams.get(trigram)
+                if bucket is not None:
+                    bucket.discard(key)
+                    if not bucket:
+                        del self._trigrams[trigram]
+
+    def add_paper(self, paper):
+        with self._lock:
+            if self._built:
+                self._add(paper.id, paper_phrases(paper))
+
+    def remove_paper(self, paper_id: int):
+        with self._lock:
+            if self._built:
+                self._remove(paper_id)
+
+    def suggest(self, keyword: str, limit: int = 5, min_score: int = 0) -> list[dict]:
+        """Return up to `limit` {"text", "score"} suggestions, best first, scored 0-100."""
+        query = normalize(keyword)
+        if not query:
+            return []
+
+        with self._lock:
+            query_trigrams = trigrams(query)
+            common_cutoff = max(1, int(len(self._phrases) * COMMON_TRIGRAM_RATIO))
+            buckets = [self._trigrams[trigram] for trigram in query_trigrams if trigram in self._trigrams]
+            selective = [bucket for bucket in buckets if len(bucket) <= common_cutoff] or buckets
+
+            overlap = Counter()
+            for bucket in selective:
+                overlap.update(bucket)
+
+            candidates = heapq.nlargest(MAX_CANDIDATES, overlap.items(), key=lambda item: item[1])
+            scored = [(fuzz.WRatio(query, key), self._phrases[key]) for key, _ in candidates]
+
+        scored = [(score, text) for score, text in scored if score >= min_score]
+        return [{"text": text, "score": score} for score, text in heapq.nlargest(limit, scored)]
+
+
+# Shared suggestion index for this worker process
+suggestion_index = SuggestionIndex()
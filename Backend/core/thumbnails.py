@@ -0,0 +1,97 @@
+import logging
+import os
+import tempfile
+from io import BytesIO
+
+import fitz
+
+from Backend.core.storage import UPLOAD_DIR
+
+logger = logging.getLogger(__name__)
+
+# Thumbnail settings from .env; sizes are "name:width" pairs, widths in pixels
+THUMBNAIL_DIR = os.getenv("THUMBNAIL_DIR", os.path.join(UPLOAD_DIR, "thumbnails"))
+THUMBNAIL_SIZES = {
+    name.strip(): int(width)
+    for name, width in (pair.split(":") for pair in os.getenv("THUMBNAIL_SIZES", "small:160,medium:320,large:640").split(","))
+}
+DEFAULT_THUMBNAIL_SIZE = os.getenv("DEFAULT_THUMBNAIL_SIZE", "medium")
+# "png", or "webp" (needs Pillow; falls back to png without it)
+THUMBNAIL_FORMAT = os.getenv("THUMBNAIL_FORMAT", "png").lower()
+THUMBNAIL_WEBP_QUALITY = int(os.getenv("THUMBNAIL_WEBP_QUALITY", "80"))
+
+MEDIA_TYPES = {"png": "image/png", "webp": "image/webp"}
+
+os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; only needed for WebP
+    Image = None
+
+
+def thumbnail_format() -> str:
+    if THUMBNAIL_FORMAT == "webp" and Image is None:
+        return "png"
+    return THUMBNAIL_FORMAT if THUMBNAIL_FORMAT in MEDIA_TYPES else "png"
+
+
+def thumbnail_path(pdf_path: str, size: str, fmt: str = None) -> str:
+    """Thumbnails are named after the stored PDF (its content hash), so identical files share them."""
+    stem = os.path.splitext(os.path.basename(pdf_path))[0]
+    return os.path.join(THUMBNAIL_DIR, f"{stem}-{size}.{fmt or thumbnail_format()}")
+
+
+def _encode(pixmap, fmt: str) -> bytes:
+    if fmt == "webp":
+        image = Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+        buffer = BytesIO()
+        image.save(buffer, "WEBP", quality=THUMBNAIL_WEBP_QUALITY)
+        return buffer.getvalue()
+    return pixmap.tobytes("png")
+
+
+def render_thumbnails(doc, pdf_path: str, sizes=None) -> dict:
+    """Render the first page of an open document at every size; returns {size: path}."""
+    fmt = thumbnail_format()
+    page = doc[0]
+    written = {}
+    for size in sizes or THUMBNAIL_SIZES:
+        zoom = THUMBNAIL_SIZES[size] / page.rect.width
+        pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False, colorspace=fitz.csRGB)
+        path = thumbnail_path(pdf_path, size, fmt)
+        with tempfile.NamedTemporaryFile(dir=THUMBNAIL_DIR, suffix=".part", delete=False) as file:
+            file.write(_encode(pixmap, fmt))
+        os.replace(file.name, path)  # Readers never see a half-written image
+        written[size] = path
+    return written
+
+
+def try_render_thumbnails(doc, pdf_path: str):
+    """Best-effort rendering during ingestion; a failure only means lazy rendering later."""
+    if not len(doc):
+        return
+    try:
+        render_thumbnails(doc, pdf_path)
+    except Exception:
+        logger.exception("Rendering thumbnails of %s failed", pdf_path)
+
+
+def ensure_thumbnail(pdf_path: str, size: str) -> str:
+    """Path of a thumbnail, rendering it first if missing (papers ingested before thumbnails existed)."""
+    path = thumbnail_path(pdf_path, size)
+    if not os.path.exists(path):
+        doc = fitz.open(pdf_path)
+        try:
+            render_thumbnails(doc, pdf_path, sizes=[size])
+        finally:
+            doc.close()
+    return path
+
+
+def remove_thumbnails(pdf_path: str):
+    for size in THUMBNAIL_SIZES:
+        for fmt in MEDIA_TYPES:
+            path = thumbnail_path(pdf_path, size, fmt)
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,154 @@
+import datetime
+import heapq
+import os
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+
+from sqlalchemy import func
+
+from Backend.core.database import SessionLocal
+from Backend.models.search_logs import SearchLog
+
+# How many days of per-day keyword counts are kept in memory
+TRENDING_RETENTION_DAYS = int(os.getenv("TRENDING_RETENTION_DAYS", "365"))
+# Seconds after which the counts are reloaded from search_logs on the next read, so searches
+# logged by other workers are counted too; 0 never reloads (single worker only)
+TRENDING_RESEED_INTERVAL = float(os.getenv("TRENDING_RESEED_INTERVAL", "300"))
+
+# Merged window totals kept warm for the most recently asked window sizes
+MAX_CACHED_WINDOWS = 8
+
+
+def _as_date(value) -> datetime.date:
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(str(value)[:10])
+
+
+class TrendingTopics:
+    """Rolling per-day keyword counts for the trending dashboard.
+
+    Seeded from search_logs and then updated as this worker's searches are logged.
+    Other workers log searches too, so the counts are reseeded `reseed_interval`
+    seconds after the last seed; between seeds they may differ from the table by the
+    other workers' searches. The merged totals of each requested window are cached
+    and updated in place, so repeated "top N over D days" queries only cost a heap
+    selection.
+    """
+
+    def __init__(self, session_factory=SessionLocal, retention_days: int = TRENDING_RETENTION_DAYS,
+                 reseed_interval: float = TRENDING_RESEED_INTERVAL):
+        self.session_factory = session_factory
+        self.retention_days = retention_days
+        self.reseed_interval = reseed_interval
+        self._lock = threading.RLock()
+        self._seeded = False
+        self._seeded_at = 0.0
+        self._days = defaultdict(Counter)  # date -> keyword counts
+        self._windows = OrderedDict()  # days -> merged keyword counts
+        self._windows_day = None  # day the cached windows were built for
+
+    @staticmethod
+    def _today() -> datetime.date:
+        return datetime.datetime.utcnow().date()
+
+    def seed(self, db=None):
+        """Load the per-day counts of the retention period from search_logs."""
+        own_session = db is None
+        db = db or self.session_factory()
+        try:
+            since = datetime.datetime.utcnow() - datetime.timedelta(days=self.retention_days)
+            day = func.date(SearchLog.date_searched)
+            rows = (
+                db.query(day, SearchLog.keyword, func.count(SearchLog.id))
+                .filter(SearchLog.date_searched >= since)
+                .group_by(day, SearchLog.keyword)
+                .all()
+            )
+        finally:
+            if own_session:
+                db.close()
+
+        with self._lock:
+            self._days.clear()
+            self._windows.clear()
+            for searched_on, keyword, count in rows:
+                self._days[_as_date(searched_on)][keyword] += count
+            self._seeded = True
+            self._seeded_at = time.monotonic()
+
+    def _current(self) -> bool:
+        return self._seeded and (self.reseed_interval <= 0
+                                 or time.monotonic() - self._seeded_at < self.reseed_interval)
+
+    def ensure_seeded(self, db=None):
+        """Seed on first use, and reseed once the counts are older than `reseed_interval`."""
+        if not self._current():
+            with self._lock:
+                if not self._current():
+                    self.seed(db)
+
+    def _roll(self, today: datetime.date):
+        if self._windows_day == today:
+            return
+        self._windows.clear()
+        self._windows_day = today
+        oldest = today - datetime.timedelta(days=self.retention_days)
+        for day in [day for day in self._days if day < oldest]:
+            del self._days[day]
+
+    def _apply(self, keyword: str, searched_at, delta: int):
+        day = _as_date(searched_at)
+        with self._lock:
+            if not self._seeded:
+                return  # Picked up by the seed query instead
+            today = self._today()
+            self._roll(today)
+            counts = self._days[day]
+            counts[keyword] += delta
+            if counts[keyword] <= 0:
+                del counts[keyword]
+            for days, window in self._windows.items():
+                if day > today - datetime.timedelta(days=days):  # A window of D days ends today
+                    window[keyword] += delta
+                    if window[keyword] <= 0:
+                        del window[keyword]
+
+    def record(self, keyword: str, searched_at):
+        self._apply(keyword, searched_at, 1)
+
+    def record_logs(self, rows: list[dict]):
+        """Count search_logs rows once they are written (see SearchLogBuffer's on_flush)."""
+        for row in rows:
+            self.record(row["keyword"], row["date_searched"])
+
+    def discard(self, keyword: str, searched_at):
+        """Forget one search, e.g. when its search_logs row is deleted."""
+        self._apply(keyword, searched_at, -1)
+
+    def top(self, limit: int = 10, days: int = 30) -> list[dict]:
+        self.ensure_seeded()
+        with self._lock:
+            today = self._today()
+            self._roll(today)
+            window = self._windows.get(days)
+            if window is None:
+                oldest = today - datetime.timedelta(days=days)
+                window = Counter()
+                for day, counts in self._days.items():
+                    if day > oldest:
+                        window.update(counts)
+                self._windows[days] = window
+                if len(self._windows) > MAX_CACHED_WINDOWS:
+                    self._windows.popitem(last=False)
+            else:
+                self._windows.move_to_end(days)
+            top = heapq.nlargest(limit, window.items(), key=lambda item: item[1])
+        return [{"keyword": keyword, "count": count} for keyword, count in top]
+
+
+# Shared aggregate for this worker process
+trending_topics = TrendingTopics()
@@ -0,0 +1,158 @@
+import asyncio
+import hashlib
+import logging
+import os
+import uuid
+
+from starlette.concurrency import run_in_threadpool
+
+from Backend.core.jobs import DONE, FAILED, RUNNING, JobRegistry
+
+logger = logging.getLogger(__name__)
+
+# Vector indexing tuning from .env
+INDEX_BATCH_SIZE = int(os.getenv("INDEX_BATCH_SIZE", "64"))  # Chunks embedded and upserted per call
+INDEX_CONCURRENCY = int(os.getenv("INDEX_CONCURRENCY", "4"))  # Batches in flight at once per job
+INDEX_MAX_JOBS = int(os.getenv("INDEX_MAX_JOBS", "1000"))
+
+# Every chunk carries the key of the document it came from, so a re-index can find its old chunks
+SOURCE_KEY = "source"
+SOURCE_FIELD = f"metadata.{SOURCE_KEY}"
+POINT_NAMESPACE = uuid.UUID("6f1c2b9e-4d1a-5b7e-9c3f-8a2d4e6b0c15")
+
+index_jobs = JobRegistry(max_jobs=INDEX_MAX_JOBS)
+
+_tasks = set()  # Strong references so running jobs are not garbage collected
+_in_flight = {}  # source -> id of the job indexing it
+
+
+def pdf_source(stored_path: str) -> str:
+    """Stored PDFs are named after their content hash, so identical bytes are one source."""
+    return f"pdf:{os.path.splitext(os.path.basename(stored_path))[0]}"
+
+
+def url_source(url: str) -> str:
+    return f"url:{url}"
+
+
+def point_id(source: str, position: int, text: str) -> str:
+    """Deterministic point ID: the same chunk of the same source always lands on the same point."""
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return str(uuid.uuid5(POINT_NAMESPACE, f"{source}\0{position}\0{digest}"))
+
+
+class VectorIndexer:
+    """Upserts the chunks of one source at a time into a QdrantVectorStore.
+
+    Chunks are embedded and upserted in batches of `batch_size`, with at most
+    `concurrency` batches in flight. Point IDs are derived from the source and each
+    chunk's position and text, so re-indexing rewrites the same points, and points of
+    the source that the new chunks no longer produce are deleted afterwards.
+    `on_change()` is called once a source has been (even partly) rewritten.
+    """
+
+    def __init__(self, vector_store, batch_size: int = INDEX_BATCH_SIZE, concurrency: int = INDEX_CONCURRENCY,
+                 on_change=None):
+        self.vector_store = vector_store
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        self.on_change = on_change
+
+    @property
+    def client(self):
+        return self.vector_store.client
+
+    @property
+    def collection_name(self) -> str:
+        return self.vector_store.collection_name
+
+    def ensure_source_index(self):
+        """Keyword index on the source field, so stale-chunk deletes don't scan the collection."""
+        from qdrant_client import models
+
+        self.client.create_payload_index(self.collection_name, field_name=SOURCE_FIELD,
+                                         field_schema=models.PayloadSchemaType.KEYWORD)
+
+    def _upsert(self, docs: list, ids: list[str]):
+        self.vector_store.add_documents(docs, ids=ids, batch_size=len(docs))
+
+    def delete_stale(self, source: str, keep_ids: list[str]) -> int:
+        """Delete the points of `source` that are not in `keep_ids`; returns how many went."""
+        from qdrant_client import models
+
+        stale = models.Filter(
+            must=[models.FieldCondition(key=SOURCE_FIELD, match=models.MatchValue(value=source))],
+            must_not=[models.HasIdCondition(has_id=keep_ids)] if keep_ids else None,
+        )
+        count = self.client.count(self.collection_name, count_filter=stale, exact=True).count
+        if count:
+            self.client.delete(self.collection_name, points_selector=models.FilterSelector(filter=stale))
+        return count
+
+    async def index(self, source: str, docs: list, progress=None) -> dict:
+        """Upsert `docs` as the complete set of chunks for `source`.
+
+        `progress(indexed)` is called after every batch with the number of chunks written so far.
+        """
+        ids = []
+        for position, doc in enumerate(docs):
+            doc.metadata = {**doc.metadata, SOURCE_KEY: source, "chunk": position}
+            ids.append(point_id(source, position, doc.page_content))
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        indexed = 0
+
+        async def upsert(start: int):
+            nonlocal indexed
+            async with semaphore:
+                end = start + self.batch_size
+                await run_in_threadpool(self._upsert, docs[start:end], ids[start:end])
+                indexed += len(ids[start:end])
+                if progress:
+                    progress(indexed)
+
+        try:
+            await asyncio.gather(*(upsert(start) for start in range(0, len(docs), self.batch_size)))
+            # Old chunks go only after the new ones are in, so the source never disappears from retrieval
+            deleted = await run_in_threadpool(self.delete_stale, source, ids)
+        finally:
+            if self.on_change:
+                self.on_change()
+        return {"indexed_chunks": indexed, "deleted_chunks": deleted}
+
+
+async def run_index_job(job_id: str, indexer: VectorIndexer, source: str, load, cleanup=None):
+    index_jobs.update(job_id, status=RUNNING)
+    try:
+        docs = await run_in_threadpool(load)
+        index_jobs.update(job_id, total_chunks=len(docs))
+        result = await indexer.index(source, docs, progress=lambda indexed: index_jobs.update(job_id, indexed_chunks=indexed))
+    except Exception as e:
+        logger.exception("Indexing of %s failed", source)
+        index_jobs.update(job_id, status=FAILED, error=str(e) or e.__class__.__name__)
+        return
+    finally:
+        _in_flight.pop(source, None)
+        if cleanup:
+            await run_in_threadpool(cleanup)
+    index_jobs.update(job_id, status=DONE, **result)
+
+
+async def submit_index(indexer: VectorIndexer, source: str, load, cleanup=None, **details) -> dict:
+    """Queue `load()` (returning the chunks of `source`) for indexing and return its job.
+
+    A source that is already being indexed shares the running job; `cleanup` then runs
+    right away, since that job owns the source's files.
+    """
+    job_id = _in_flight.get(source)
+    if job_id and (job := index_jobs.get(job_id)):
+        if cleanup:
+            await run_in_threadpool(cleanup)
+        return job
+
+    job = index_jobs.create(source=source, total_chunks=None, indexed_chunks=0, deleted_chunks=0, **details)
+    _in_flight[source] = job["id"]
+    task = asyncio.create_task(run_index_job(job["id"], indexer, source, load, cleanup))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return job
@@ -2,9 +2,9 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from datetime import datetime, timedelta
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
 
-from Backend.core.database import get_db
+from Backend.core.database import SessionLocal
+from Backend.core.principal_cache import principal_cache
 from Backend.models.admin import Admin
 
 router = APIRouter()
@@ -28,16 +28,23 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):  # ✅ Now this works!
+def get_current_user(token: str = Depends(oauth2_scheme)):  # ✅ Now this works!
+    # Tokens verified recently skip the JWT decode and the admins lookup
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return dict(principal)
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
         role: str = payload.get("role")  # Ensure the role exists
 
-        db_admin = db.query(Admin).filter(Admin.username == username).first()
+        with SessionLocal() as db:
+            db_admin = db.query(Admin.id).filter(Admin.username == username).first()
         if not db_admin:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized User")
-        return {"username": username, "role": role}
+        principal = {"username": username, "role": role}
+        principal_cache.set(token, username, principal, payload.get("exp"))
+        return dict(principal)  # Callers never get the cached dict itself
     except JWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
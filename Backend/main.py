@@ -1,13 +1,42 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.cors import CORSMiddleware
-from starlette.staticfiles import StaticFiles
-from Backend.core.database import engine, Base
+from Backend.core.database import async_engine, engine, Base
+from Backend.core.ingestion import shutdown_process_pool
+from Backend.core.migrations import upgrade_schema
+from Backend.core.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
+from Backend.core.passwords import shutdown_hash_pool
+from Backend.core.query_stats import QUERY_COUNT_HEADER, QUERY_TIME_HEADER, query_stats_middleware
+from Backend.core.rag import RAG_WARM_UP, rag
+from Backend.core.reaction_buffer import reaction_buffer
+from Backend.core.search_log_buffer import search_log_buffer
+from Backend.core.trending import trending_topics
 from Backend.routers import research_papers, admin, uniqe_function, authors, search_logs,comment
 import uvicorn
-app = FastAPI()
+
+
+# Start background workers with the app and drain them on shutdown
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await run_in_threadpool(trending_topics.seed)  # Seed before new searches start being recorded
+    search_log_buffer.start()
+    if RAG_WARM_UP:
+        await rag.start()  # Bounded by RAG_INIT_TIMEOUT; the app starts even if Qdrant is unreachable
+    yield
+    search_log_buffer.stop()
+    reaction_buffer.stop()  # Apply reactions still pending in the buffer
+    shutdown_process_pool()
+    shutdown_hash_pool()
+    await async_engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Create tables
 Base.metadata.create_all(bind=engine)
+upgrade_schema(engine)  # Changes create_all() does not make to existing tables
 
 # Add CORS middleware to allow requests from specific origins
 app.add_middleware(
@@ -16,10 +45,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all HTTP methods (GET, POST, etc.)
     allow_headers=["*"],  # Allows all headers
+    expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER,  # Let the frontend read pagination headers
+                    QUERY_COUNT_HEADER, QUERY_TIME_HEADER],
 )
 
-# Mount static files for serving uploaded PDFs
-app.mount("/files", StaticFiles(directory="uploads"), name="files")
+# Count queries and DB time per request (X-DB-Queries / X-DB-Time-Ms, GET /api/admin/db-stats)
+app.middleware("http")(query_stats_middleware)
 
 # Include Research Paper API
 app.include_router(research_papers.router, prefix="/api", tags=["Research Papers"])
@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String, ForeignKey, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import query_expression, relationship
 from Backend.core.database import Base
 
 
@@ -14,6 +14,10 @@ class Author(Base):
 
     achievements = relationship("Achievement", back_populates="author", cascade="all, delete-orphan")
 
+    # Aggregates over achievements, computed in SQL only when a read asks for them
+    achievement_count = query_expression()
+    latest_achievement_year = query_expression()
+
 
 class Achievement(Base):
     __tablename__ = "achievements"
@@ -10,7 +10,7 @@ class ResearchPaper(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     author = Column(String(255), nullable=False)
-    year = Column(Integer, nullable=False)
+    year = Column(Integer, nullable=True)  # NULL when no year was found in the PDF
     introduction = Column(Text, nullable=True)  # ✅ Add Introduction Column
-    file_path = Column(String(255), nullable=False)  # Store PDF file path
+    file_path = Column(String(255), nullable=False, index=True)  # Store PDF file path (uploads/<sha256>.pdf)
     comments = relationship("Comment", back_populates="paper", cascade="all, delete")
\ No newline at end of file
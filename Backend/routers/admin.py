@@ -1,11 +1,13 @@
-import os
 from datetime import datetime, timedelta
 
-import bcrypt
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from jose import jwt
-from sqlalchemy.orm import Session
-from Backend.core.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from Backend.core.database import async_engine, engine, get_async_db
+from Backend.core.passwords import hash_password_async, needs_rehash, verify_password_async
+from Backend.core.query_stats import query_stats
+from Backend.dependencies.auth import get_current_user
 from Backend.models.admin import Admin
 from Backend.schemas.admin import AdminResponse, AdminCreate, AdminLogin
 
@@ -15,15 +17,6 @@ router = APIRouter()
 SECRET_KEY = "your_secret_key_here"
 ALGORITHM = "HS256"
 
-# 📌 Hash Password
-def hash_password(password: str) -> str:
-    salt = bcrypt.gensalt()
-    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
-
-# 📌 Verify Password
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
-
 # 📌 Generate JWT Token
 def create_jwt_token(admin_id: int, username: str):
     expire = datetime.utcnow() + timedelta(hours=24)
@@ -32,25 +25,41 @@ def create_jwt_token(admin_id: int, username: str):
 
 # 📌 Admin Registration
 @router.post("/register/", response_model=AdminResponse)
-async def register_admin(admin: AdminCreate, db: Session = Depends(get_db)):
-    existing_admin = db.query(Admin).filter(Admin.username == admin.username).first()
+async def register_admin(admin: AdminCreate, db: AsyncSession = Depends(get_async_db)):
+    existing_admin = await db.scalar(select(Admin).where(Admin.username == admin.username))
     if existing_admin:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username already exists")
 
-    hashed_password = hash_password(admin.password)
+    hashed_password = await hash_password_async(admin.password)
     new_admin = Admin(name=admin.name, email=admin.email, username=admin.username, password_hash=hashed_password)
     db.add(new_admin)
-    db.commit()
-    db.refresh(new_admin)
+    await db.commit()
+    await db.refresh(new_admin)
 
     return new_admin
 
 # 📌 Admin Login
 @router.post("/login/")
-async def login_admin(admin: AdminLogin, db: Session = Depends(get_db)):
-    db_admin = db.query(Admin).filter(Admin.username == admin.username).first()
-    if not db_admin or not verify_password(admin.password, db_admin.password_hash):
+async def login_admin(admin: AdminLogin, db: AsyncSession = Depends(get_async_db)):
+    db_admin = await db.scalar(select(Admin).where(Admin.username == admin.username))
+    if not db_admin or not await verify_password_async(admin.password, db_admin.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
+    # Upgrade the stored hash when BCRYPT_ROUNDS changed since it was made
+    if needs_rehash(db_admin.password_hash):
+        db_admin.password_hash = await hash_password_async(admin.password)
+        await db.commit()
+
     token = create_jwt_token(db_admin.id, db_admin.username)
     return {"access_token": token, "token_type": "bearer"}
+
+# 📌 Connection pool utilisation and the slowest recent statements
+@router.get("/admin/db-stats")
+def get_db_stats(slowest: int = Query(20, ge=1, le=200), current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admins can view database stats")
+    return {
+        "pools": {"sync": engine.pool.stats(), "async": async_engine.pool.stats()},
+        "queries": query_stats.stats(),
+        "slowest": query_stats.slowest(slowest),
+    }
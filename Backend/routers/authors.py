@@ -1,11 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from Backend.core.database import get_db
+from Backend.core.pagination import PageParams, paginate
+from Backend.core.projection import Projection, ProjectionParams
+from Backend.core.response_cache import cached_json, response_cache
 from Backend.models.authors import Author, Achievement
-from Backend.schemas.authors import AuthorCreate, AuthorResponse, AuthorUpdate, AchievementCreate, AchievementResponse
+from Backend.schemas.authors import AuthorCreate, AuthorPartial, AuthorResponse, AuthorUpdate, AchievementCreate, AchievementResponse
 
 router = APIRouter()
 
+# Achievement aggregates per author, as correlated subqueries of the author SELECT
+def achievement_aggregate(function):
+    return (select(function).where(Achievement.author_id == Author.id)
+            .correlate(Author).scalar_subquery())
+
+# Fields returned by ?view=summary|full; summary skips expertise and achievements.
+# achievement_count / latest_achievement_year are only computed when listed in ?fields=
+author_projection = Projection(
+    Author,
+    summary=["id", "name", "affiliation", "email"],
+    full=["id", "name", "affiliation", "email", "areas_of_expertise", "achievements"],
+    relationships={"achievements": lambda achievements: [
+        AchievementResponse.model_validate(achievement, from_attributes=True) for achievement in achievements]},
+    expressions={
+        "achievement_count": achievement_aggregate(func.count(Achievement.id)),
+        "latest_achievement_year": achievement_aggregate(func.max(Achievement.year)),
+    },
+)
+
 # 📌 Add a New Author
 @router.post("/authors/", response_model=AuthorResponse, status_code=status.HTTP_201_CREATED)
 def create_author(author: AuthorCreate, db: Session = Depends(get_db)):
@@ -20,12 +43,18 @@ def create_author(author: AuthorCreate, db: Session = Depends(get_db)):
     return new_author
 
 # 📌 Get Author by ID
-@router.get("/authors/{author_id}", response_model=AuthorResponse)
-def get_author(author_id: int, db: Session = Depends(get_db)):
-    author = db.query(Author).filter(Author.id == author_id).first()
-    if not author:
-        raise HTTPException(status_code=404, detail="Author not found")
-    return author
+@router.get("/authors/{author_id}", response_model=AuthorPartial, response_model_exclude_unset=True)
+def get_author(author_id: int, request: Request, projection: ProjectionParams = Depends(),
+               db: Session = Depends(get_db)):
+    selected = author_projection.select(projection)
+
+    def build(response):
+        author = db.query(Author).options(*author_projection.options(selected)).filter(Author.id == author_id).first()
+        if not author:
+            raise HTTPException(status_code=404, detail="Author not found")
+        return author_projection.dump(author, selected)
+
+    return cached_json(request, (f"author:{author_id}",), build)
 
 # 📌 Update an Author
 @router.put("/authors/{author_id}", response_model=AuthorResponse)
@@ -39,6 +68,7 @@ def update_author(author_id: int, author_update: AuthorUpdate, db: Session = Dep
 
     db.commit()
     db.refresh(author)
+    response_cache.invalidate(f"author:{author_id}")
     return author
 
 # 📌 Delete an Author
@@ -50,6 +80,7 @@ def delete_author(author_id: int, db: Session = Depends(get_db)):
 
     db.delete(author)
     db.commit()
+    response_cache.invalidate(f"author:{author_id}")
     return {"message": "Author deleted successfully"}
 
 # 📌 Add an Achievement to an Author
@@ -63,6 +94,7 @@ def add_achievement(author_id: int, achievement: AchievementCreate, db: Session
     db.add(new_achievement)
     db.commit()
     db.refresh(new_achievement)
+    response_cache.invalidate(f"author:{author_id}")
     return new_achievement
 
 # 📌 Delete an Achievement
@@ -72,13 +104,18 @@ def delete_achievement(achievement_id: int, db: Session = Depends(get_db)):
     if not achievement:
         raise HTTPException(status_code=404, detail="Achievement not found")
 
+    author_id = achievement.author_id
     db.delete(achievement)
     db.commit()
+    response_cache.invalidate(f"author:{author_id}")
     return {"message": "Achievement deleted successfully"}
 
-@router.get("/authors", response_model=list[AuthorResponse])
-def get_all_authors(db: Session = Depends(get_db)):
-    authors = db.query(Author).all()
-    if not authors:
+@router.get("/authors", response_model=list[AuthorPartial], response_model_exclude_unset=True)
+def get_all_authors(response: Response, page: PageParams = Depends(), projection: ProjectionParams = Depends(),
+                    db: Session = Depends(get_db)):
+    selected = author_projection.select(projection)
+    statement = select(Author).options(*author_projection.options(selected))
+    authors = paginate(db, statement, [(Author.id, False)], page, response)
+    if not authors and not page.cursor:
         raise HTTPException(status_code=404, detail="No authors found")
-    return authors
+    return [author_projection.dump(author, selected) for author in authors]
@@ -1,12 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 from typing import List
-from Backend.schemas.comment import CommentResponse, CommentCreate, CommentUpdate
+from Backend.schemas.comment import CommentPartial, CommentResponse, CommentCreate, CommentUpdate
 from Backend.models.comment import Comment
 from Backend.core.database import get_db
+from Backend.core.pagination import PageParams, paginate
+from Backend.core.projection import Projection, ProjectionParams
+from Backend.core.reaction_buffer import REACTION_BUFFER_ENABLED, reaction_buffer
+from Backend.core.response_cache import cached_json, response_cache
 
 router = APIRouter()
 
+# Drop the cached comment listing of a paper after any change to its comments
+def invalidate_paper_comments(paper_id: int):
+    response_cache.invalidate(f"comments:paper:{paper_id}")
+
 @router.post("/", response_model=CommentResponse)
 def create_comment(comment: CommentCreate, db: Session = Depends(get_db)):
     db_comment = Comment(
@@ -18,20 +27,39 @@ def create_comment(comment: CommentCreate, db: Session = Depends(get_db)):
     db.add(db_comment)
     db.commit()
     db.refresh(db_comment)
+    invalidate_paper_comments(db_comment.paper_id)
     return db_comment
 
-@router.get("/paper/{paper_id}", response_model=List[CommentResponse])
-def get_comments_for_paper(paper_id: int, db: Session = Depends(get_db)):
-    return (
-        db.query(Comment)
-        .filter(Comment.paper_id == paper_id, Comment.approved == True)
-        .order_by(Comment.created_at.desc())
-        .all()
-    )
+# Keyset orderings; each ends with the primary key so pages are stable
+# Ids grow with created_at and, unlike it, are never NULL, so newest first is id order
+NEWEST_FIRST = [(Comment.id, True)]
+# likes changes: a comment liked between two page fetches can be skipped or repeated
+MOST_LIKED_FIRST = [(Comment.likes, True), (Comment.id, True)]
+
+# Fields returned by ?view=summary|full; summary leaves out the comment text
+comment_projection = Projection(
+    Comment,
+    summary=["id", "name", "paper_id", "paper_title", "created_at", "likes", "dislikes", "approved"],
+    full=["id", "name", "comment", "paper_id", "paper_title", "created_at", "likes", "dislikes", "approved"],
+)
 
-@router.get("/", response_model=List[CommentResponse])
-def get_comments(db: Session = Depends(get_db)):
-    return db.query(Comment).filter(Comment.approved == True).order_by(Comment.likes.desc(), Comment.created_at.desc()).all()
+def list_comments(db: Session, statement, order, page: PageParams, projection: ProjectionParams, response: Response):
+    selected = comment_projection.select(projection)
+    statement = statement.options(*comment_projection.options(selected, extra_columns=[column for column, _ in order]))
+    return [comment_projection.dump(comment, selected) for comment in paginate(db, statement, order, page, response)]
+
+@router.get("/paper/{paper_id}", response_model=List[CommentPartial], response_model_exclude_unset=True)
+def get_comments_for_paper(paper_id: int, request: Request, page: PageParams = Depends(),
+                           projection: ProjectionParams = Depends(), db: Session = Depends(get_db)):
+    statement = select(Comment).where(Comment.paper_id == paper_id, Comment.approved == True)
+    return cached_json(request, (f"comments:paper:{paper_id}",),
+                       lambda response: list_comments(db, statement, NEWEST_FIRST, page, projection, response))
+
+@router.get("/", response_model=List[CommentPartial], response_model_exclude_unset=True)
+def get_comments(response: Response, page: PageParams = Depends(), projection: ProjectionParams = Depends(),
+                 db: Session = Depends(get_db)):
+    statement = select(Comment).where(Comment.approved == True)
+    return list_comments(db, statement, MOST_LIKED_FIRST, page, projection, response)
 
 @router.put("/{comment_id}", response_model=CommentResponse)
 def update_comment(comment_id: int, updated_comment: CommentUpdate, db: Session = Depends(get_db)):
@@ -42,6 +70,7 @@ def update_comment(comment_id: int, updated_comment: CommentUpdate, db: Session
     comment.comment = updated_comment.comment
     db.commit()
     db.refresh(comment)
+    invalidate_paper_comments(comment.paper_id)
     return comment
 
 
@@ -50,34 +79,47 @@ def delete_comment(comment_id: int, db: Session = Depends(get_db)):
     comment = db.query(Comment).filter(Comment.id == comment_id).first()
     if not comment:
         raise HTTPException(status_code=404, detail="Comment not found")
+    paper_id = comment.paper_id
     db.delete(comment)
     db.commit()
+    reaction_buffer.discard(comment_id)
+    invalidate_paper_comments(paper_id)
     return
 
-@router.post("/{comment_id}/like", response_model=CommentResponse)
-def like_comment(comment_id: int, db: Session = Depends(get_db)):
-    comment = db.query(Comment).filter(Comment.id == comment_id).first()
-    if not comment:
+def add_reaction(db: Session, comment_id: int, likes: int = 0, dislikes: int = 0):
+    """Count a like/dislike with one atomic UPDATE, or hand it to the reaction buffer when enabled."""
+    if REACTION_BUFFER_ENABLED:
+        comment = db.get(Comment, comment_id)
+        if not comment:
+            raise HTTPException(status_code=404, detail="Comment not found")
+        pending_likes, pending_dislikes = reaction_buffer.add(comment_id, comment.paper_id, likes, dislikes)
+        return CommentResponse.model_validate(comment).model_copy(
+            update={"likes": comment.likes + pending_likes, "dislikes": comment.dislikes + pending_dislikes})
+
+    result = db.execute(update(Comment).where(Comment.id == comment_id)
+                        .values(likes=Comment.likes + likes, dislikes=Comment.dislikes + dislikes))
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Comment not found")
-    comment.likes += 1
     db.commit()
-    db.refresh(comment)
+    comment = db.get(Comment, comment_id)
+    if not comment:  # Deleted right after the update
+        raise HTTPException(status_code=404, detail="Comment not found")
+    invalidate_paper_comments(comment.paper_id)
     return comment
 
+@router.post("/{comment_id}/like", response_model=CommentResponse)
+def like_comment(comment_id: int, db: Session = Depends(get_db)):
+    return add_reaction(db, comment_id, likes=1)
+
 @router.post("/{comment_id}/dislike", response_model=CommentResponse)
 def dislike_comment(comment_id: int, db: Session = Depends(get_db)):
-    comment = db.query(Comment).filter(Comment.id == comment_id).first()
-    if not comment:
-        raise HTTPException(status_code=404, detail="Comment not found")
-    comment.dislikes += 1
-    db.commit()
-    db.refresh(comment)
-    return comment
+    return add_reaction(db, comment_id, dislikes=1)
 
 # Admin: Get all comments (approved + unapproved)
-@router.get("/moderation", response_model=List[CommentResponse])
-def get_all_comments(db: Session = Depends(get_db)):
-    return db.query(Comment).order_by(Comment.created_at.desc()).all()
+@router.get("/moderation", response_model=List[CommentPartial], response_model_exclude_unset=True)
+def get_all_comments(response: Response, page: PageParams = Depends(), projection: ProjectionParams = Depends(),
+                     db: Session = Depends(get_db)):
+    return list_comments(db, select(Comment), NEWEST_FIRST, page, projection, response)
 
 @router.post("/{comment_id}/approve", response_model=CommentResponse)
 def approve_comment(comment_id: int, db: Session = Depends(get_db)):
@@ -87,11 +129,13 @@ def approve_comment(comment_id: int, db: Session = Depends(get_db)):
     comment.approved = True
     db.commit()
     db.refresh(comment)
+    invalidate_paper_comments(comment.paper_id)
     return comment
 
-@router.get("/{comment_id}", response_model=CommentResponse)
-def get_comment(comment_id: int, db: Session = Depends(get_db)):
-    comment = db.query(Comment).filter(Comment.id == comment_id).first()
+@router.get("/{comment_id}", response_model=CommentPartial, response_model_exclude_unset=True)
+def get_comment(comment_id: int, projection: ProjectionParams = Depends(), db: Session = Depends(get_db)):
+    selected = comment_projection.select(projection)
+    comment = db.query(Comment).options(*comment_projection.options(selected)).filter(Comment.id == comment_id).first()
     if not comment:
         raise HTTPException(status_code=404, detail="Comment not found")
-    return comment
+    return comment_projection.dump(comment, selected)
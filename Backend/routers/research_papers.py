@@ -1,94 +1,161 @@
 import os
 import re
-import uuid
+import zipfile
 
-import fitz
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Query, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 from starlette.responses import FileResponse
 
-from Backend.core.database import get_db
+from Backend.core.database import get_async_db
+from Backend.core.file_delivery import THUMBNAIL_MAX_AGE, file_response
+from Backend.core.ingestion import ingest_batch, submit_upload, upload_jobs
+from Backend.core.page_text import remove_pages
+from Backend.core.pagination import PageParams, paginate_async
+from Backend.core.paper_hooks import index_paper, unindex_paper
+from Backend.core.projection import Projection, ProjectionParams
+from Backend.core.response_cache import cached_json_async
+from Backend.core.storage import MAX_BATCH_FILES, UploadTooLarge, store_upload, store_zip_members
+from Backend.core.thumbnails import (DEFAULT_THUMBNAIL_SIZE, MEDIA_TYPES, THUMBNAIL_SIZES, ensure_thumbnail,
+                                     remove_thumbnails, thumbnail_format)
 from Backend.dependencies.auth import get_current_user
 from Backend.models.research_papers import ResearchPaper
-from Backend.schemas.research_papers import ResearchPaperResponse
+from Backend.schemas.research_papers import BatchUploadResponse, ResearchPaperPartial, ResearchPaperResponse, UploadJobResponse
 
 router = APIRouter()
 
-UPLOAD_DIR = "uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-
-
-# 📌 Function to Extract Metadata from PDF
-def extract_metadata_from_pdf(pdf_path):
-    doc = fitz.open(pdf_path)
-    text = "\n".join([page.get_text("text") for page in doc])  # Extract text from all pages
-
-    metadata = {}
-
-    # Extract Title (Assume the first non-empty line is the title)
-    title_match = re.search(r"(?m)^(.*?)(?:\n|$)", text)
-    metadata["title"] = title_match.group(1).strip() if title_match else "Unknown Title"
-
-    # Extract Authors (Look for a list of names near "University", "Department")
-    author_match = re.search(r"(?m)^\s*(.+?)\n.*\b(?:University|Institute|Department|Faculty)\b", text)
-    metadata["authors"] = author_match.group(1).strip() if author_match else "Unknown Authors"
-
-    # Extract Year (Find a 4-digit year like 2020, 2021)
-    year_match = re.search(r"\b(19\d{2}|20\d{2})\b", text)
-    metadata["year"] = year_match.group(1) if year_match else "Unknown Year"
-
-    # Extract Introduction (Find text after "Introduction" heading)
-    intro_match = re.search(r"(?i)\bIntroduction\b(.*?)(?=\b(?:Methodology|Materials|Related Work|Background)\b)", text,
-                            re.DOTALL)
-    metadata["introduction"] = intro_match.group(1).strip() if intro_match else "Introduction not found"
-
-    return metadata
+# Fields returned by ?view=summary|full; summary leaves out the introduction text
+paper_projection = Projection(
+    ResearchPaper,
+    summary=["id", "title", "author", "year", "file_path"],
+    full=["id", "title", "author", "year", "introduction", "file_path"],
+)
 
 
 # 📌 Upload Research Paper (Admins Only)
-@router.post("/upload/", response_model=ResearchPaperResponse)
+# The PDF is saved and queued; metadata extraction runs in the ingestion process pool.
+# Byte-identical re-uploads return the paper that already exists.
+@router.post("/upload/", response_model=UploadJobResponse, status_code=status.HTTP_202_ACCEPTED)
 async def upload_paper(
         file: UploadFile = File(...),
-        db: Session = Depends(get_db),
         current_user: dict = Depends(get_current_user)  # Ensure user is admin
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admins can upload research papers")
 
-    paper_id = str(uuid.uuid4())  # Generate unique ID
-    file_path = os.path.join(UPLOAD_DIR, f"{paper_id}_{file.filename.replace(' ', '_')}")
+    # Stream the file to disk under its content hash
+    try:
+        stored = await store_upload(file)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
 
-    # Save the file locally
-    with open(file_path, "wb") as f:
-        f.write(await file.read())
+    return await submit_upload(stored, file.filename)
 
-    # Extract metadata
-    metadata = extract_metadata_from_pdf(file_path)
-    title, authors, year, introduction = metadata["title"], metadata["authors"], metadata["year"], metadata[
-        "introduction"]
 
-    # Save to MySQL database
-    new_paper = ResearchPaper(title=title, author=authors, year=year, introduction=introduction, file_path=file_path)
-    db.add(new_paper)
-    db.commit()
-    db.refresh(new_paper)
+# 📌 Upload Many Research Papers at Once (Admins Only)
+# Accepts PDFs and ZIP archives of PDFs; returns a per-file report once everything is ingested.
+@router.post("/upload/batch", response_model=BatchUploadResponse)
+async def upload_papers_batch(
+        files: list[UploadFile] = File(...),
+        current_user: dict = Depends(get_current_user)  # Ensure user is admin
+):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admins can upload research papers")
 
-    return new_paper
+    items = []
+    for file in files:
+        if len(items) >= MAX_BATCH_FILES:
+            items.append({"filename": file.filename, "error": f"Batch is limited to {MAX_BATCH_FILES} files"})
+            continue
+        if file.filename.lower().endswith(".zip"):
+            try:
+                items.extend(await run_in_threadpool(
+                    store_zip_members, file.file, max_files=MAX_BATCH_FILES - len(items)))
+            except zipfile.BadZipFile as e:
+                items.append({"filename": file.filename, "error": str(e)})
+            continue
+        try:
+            items.append({"filename": file.filename, "stored": await store_upload(file)})
+        except UploadTooLarge as e:
+            items.append({"filename": file.filename, "error": str(e)})
+
+    report = await ingest_batch(items)
+    return {
+        "created": sum(item["status"] == "created" for item in report),
+        "duplicates": sum(item["status"] == "duplicate" for item in report),
+        "failed": sum(item["status"] == "failed" for item in report),
+        "files": report,
+    }
+
+
+# 📌 Check the Status of an Upload
+@router.get("/upload/jobs/{job_id}", response_model=UploadJobResponse)
+async def get_upload_job(job_id: str, current_user: dict = Depends(get_current_user)):
+    job = upload_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Upload job not found")
+    return job
 
 
 # 📌 View All Research Papers
-@router.get("/papers/", response_model=list[ResearchPaperResponse])
-async def get_all_papers(db: Session = Depends(get_db)):
-    return db.query(ResearchPaper).all()
+@router.get("/papers/", response_model=list[ResearchPaperPartial], response_model_exclude_unset=True)
+async def get_all_papers(request: Request, page: PageParams = Depends(), projection: ProjectionParams = Depends(),
+                         db: AsyncSession = Depends(get_async_db)):
+    selected = paper_projection.select(projection)
+    order = [(ResearchPaper.id, False)]
+    statement = select(ResearchPaper).options(*paper_projection.options(selected))
+
+    async def build(response):
+        papers = await paginate_async(db, statement, order, page, response)
+        return [paper_projection.dump(paper, selected) for paper in papers]
+
+    return await cached_json_async(request, ("papers",), build)
 
 
 # 📌 View a Specific Research Paper
-@router.get("/papers/{paper_id}", response_model=ResearchPaperResponse)
-async def get_paper(paper_id: int, db: Session = Depends(get_db)):
-    paper = db.query(ResearchPaper).filter(ResearchPaper.id == paper_id).first()
-    if not paper:
+@router.get("/papers/{paper_id}", response_model=ResearchPaperPartial, response_model_exclude_unset=True)
+async def get_paper(paper_id: int, request: Request, projection: ProjectionParams = Depends(),
+                    db: AsyncSession = Depends(get_async_db)):
+    selected = paper_projection.select(projection)
+
+    async def build(response):
+        paper = await db.scalar(select(ResearchPaper).options(*paper_projection.options(selected))
+                                .where(ResearchPaper.id == paper_id))
+        if not paper:
+            raise HTTPException(status_code=404, detail="Paper not found")
+        return paper_projection.dump(paper, selected)
+
+    return await cached_json_async(request, (f"paper:{paper_id}",), build)
+
+
+# 📌 Deliver the PDF of a Paper (Range requests, ETag / Last-Modified, 304)
+@router.api_route("/papers/{paper_id}/file", methods=["GET", "HEAD"], response_class=FileResponse)
+async def get_paper_file(paper_id: int, request: Request, download: bool = False,
+                         db: AsyncSession = Depends(get_async_db)):
+    row = (await db.execute(select(ResearchPaper.title, ResearchPaper.file_path)
+                            .where(ResearchPaper.id == paper_id))).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Paper not found")
+    name = re.sub(r"[^\w\- ]+", "", row.title).strip() or f"paper-{paper_id}"
+    return file_response(request, row.file_path, "application/pdf", filename=f"{name}.pdf", inline=not download)
+
+
+# 📌 First-page Thumbnail of a Paper (rendered on first request for older papers)
+@router.get("/papers/{paper_id}/thumbnail", response_class=FileResponse)
+async def get_paper_thumbnail(paper_id: int, request: Request,
+                              size: str = Query(DEFAULT_THUMBNAIL_SIZE, pattern=f"^({'|'.join(THUMBNAIL_SIZES)})$"),
+                              db: AsyncSession = Depends(get_async_db)):
+    file_path = await db.scalar(select(ResearchPaper.file_path).where(ResearchPaper.id == paper_id))
+    if not file_path:
         raise HTTPException(status_code=404, detail="Paper not found")
-    return paper
+    if not os.path.exists(file_path):
+        raise HTTPException(status_code=404, detail="File not found")
+    try:
+        path = await run_in_threadpool(ensure_thumbnail, file_path, size)
+    except (RuntimeError, IndexError, ValueError):  # Unreadable or empty PDF
+        raise HTTPException(status_code=404, detail="Thumbnail not available")
+    return file_response(request, path, MEDIA_TYPES[thumbnail_format()], max_age=THUMBNAIL_MAX_AGE)
 
 
 # 📌 Update Research Paper Details (Admins Only)
@@ -99,9 +166,9 @@ async def update_paper(
         author: str = Form(None),
         year: int = Form(None),
         introduction: str = Form(None),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
 ):
-    paper = db.query(ResearchPaper).filter(ResearchPaper.id == paper_id).first()
+    paper = await db.get(ResearchPaper, paper_id)
     if not paper:
         raise HTTPException(status_code=404, detail="Paper not found")
 
@@ -115,41 +182,35 @@ async def update_paper(
     if introduction:
         paper.introduction = introduction
 
-    db.commit()
-    db.refresh(paper)
+    await db.commit()
+    await db.refresh(paper)
+    index_paper(paper)
 
-    return {"message": "Paper updated successfully", "paper": paper}
+    return {"message": "Paper updated successfully", "paper": ResearchPaperResponse.model_validate(paper)}
 
 
 # 📌 Delete Research Paper (Admins Only)
 @router.delete("/papers/{paper_id}")
-async def delete_paper(paper_id: int, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+async def delete_paper(paper_id: int, db: AsyncSession = Depends(get_async_db),
+                       current_user: dict = Depends(get_current_user)):
     # Check if user is admin
     if current_user["role"] != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admins can delete research papers")
 
-    paper = db.query(ResearchPaper).filter(ResearchPaper.id == paper_id).first()
+    paper = await db.get(ResearchPaper, paper_id)
     if not paper:
         raise HTTPException(status_code=404, detail="Paper not found")
 
-    # Delete the file from the server
+    # Delete the file, its thumbnails and stored text from the server
     if os.path.exists(paper.file_path):
         os.remove(paper.file_path)
+    remove_thumbnails(paper.file_path)
+    remove_pages(paper.file_path)
 
     # Delete from MySQL
-    db.delete(paper)
-    db.commit()
+    await db.delete(paper)
+    await db.commit()
+    unindex_paper(paper_id)
 
     return {"message": "Paper deleted successfully"}
 
-
-@router.get("/download/{filename}")
-async def download_file(filename: str):
-    file_path = f"uploads/{filename}"
-    return FileResponse(file_path, media_type="application/pdf")
-
-
-@router.get("/download/{filename}")
-async def download_file(filename: str):
-    file_path = f"uploads/{filename}"  # Adjust path based on where PDFs are stored
-    return FileResponse(file_path, filename=filename, media_type="application/pdf")
@@ -1,14 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 import datetime
 import os
 from fpdf import FPDF
 from dotenv import load_dotenv
-from fuzzywuzzy import process
 
 # Import Models & Schemas
 from Backend.core.database import get_db
+from Backend.core.pagination import PageParams, paginate
+from Backend.core.search_index import search_index
+from Backend.core.search_log_buffer import search_log_buffer
+from Backend.core.suggestions import suggestion_index
+from Backend.core.trending import TRENDING_RETENTION_DAYS, trending_topics
 from Backend.models.research_papers import ResearchPaper
 from Backend.models.search_logs import SearchLog
 from Backend.schemas.search_logs import SearchLogSchema, SearchLogRequest, TrendingTopicsResponse
@@ -24,69 +28,70 @@ os.makedirs('uploads', exist_ok=True)
 
 # ✅ Fetch Search Logs
 @router.get("/search/logs", response_model=list[SearchLogSchema])
-def get_search_logs(db: Session = Depends(get_db)):
-    return db.query(SearchLog).all()
+def get_search_logs(response: Response, page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginate(db, select(SearchLog), [(SearchLog.id, False)], page, response)
 
 
-def find_closest_match(keyword: str, db: Session):
-    """Find the closest matching keyword from titles, authors, or abstracts in the DB."""
-    paper_data = db.query(ResearchPaper.title, ResearchPaper.author, ResearchPaper.introduction).all()
-    all_keywords = [item for sublist in paper_data for item in sublist if item]
+# ✅ Search Log Buffer Counters
+@router.get("/search/logs/stats")
+def get_search_log_stats():
+    return search_log_buffer.stats()
 
-    if not all_keywords:
-        return None
 
-    best_match, score = process.extractOne(keyword, all_keywords)
-    return best_match if score >= 70 else None  # Only return if similarity is above 70%
+def find_closest_matches(keyword: str, db: Session, limit: int = 5):
+    """Find the closest matching titles, author names or key phrases from the suggestion index."""
+    suggestion_index.ensure_built(db)
+    return suggestion_index.suggest(keyword, limit=limit, min_score=70)  # Only keep similarity above 70%
+
+
+# ✅ "Did you mean" Suggestions
+@router.get("/search/suggest")
+def suggest_keywords(q: str, limit: int = Query(5, ge=1, le=20), db: Session = Depends(get_db)):
+    return {"query": q, "suggestions": find_closest_matches(q, db, limit=limit)}
 
 # ✅ Search for Research Papers
 @router.post("/search", response_model=dict)
 def search_paper(request: SearchLogRequest, db: Session = Depends(get_db)):
-    """Search for a research paper in the database. If not found, suggest a possible match."""
-
-    papers = db.query(ResearchPaper).filter(
-        (ResearchPaper.title.ilike(f"%{request.keyword}%")) |
-        (ResearchPaper.author.ilike(f"%{request.keyword}%")) |
-        (ResearchPaper.introduction.ilike(f"%{request.keyword}%")) |
-        (ResearchPaper.year.ilike(f"%{request.keyword}%"))
-    ).all()
-
-    if papers:
-        log = SearchLog(keyword=request.keyword, found_in_db=True, date_searched=datetime.datetime.utcnow())
-        db.add(log)
-        db.commit()
-        return {"results": [{
+    """Search for research papers through the ranked full-text index. If not found, suggest a possible match."""
+
+    search_index.ensure_built(db)
+    hits, total = search_index.search(request.keyword, limit=request.limit, offset=request.offset)
+
+    if total:
+        if request.offset == 0:  # Log the search once, not once per page
+            searched_at = datetime.datetime.utcnow()
+            search_log_buffer.enqueue(request.keyword, found_in_db=True, date_searched=searched_at)
+
+        # Only the papers on the requested page are loaded, then put back in ranked order
+        papers = {paper.id: paper for paper in
+                  db.query(ResearchPaper).filter(ResearchPaper.id.in_([paper_id for paper_id, _ in hits])).all()}
+        return {"total": total, "results": [{
+            "id": paper.id,
             "title": paper.title,
             "author": paper.author,
             "abstract": paper.introduction or "Abstract not available",
-            "file_path": f"http://127.0.0.1:8005/uploads/{paper.file_path}" if paper.file_path else None,
+            "file_path": f"/api/papers/{paper.id}/file" if paper.file_path else None,
+            "score": round(score, 4),
             "source": "Database"
-        } for paper in papers]}
+        } for paper_id, score in hits if (paper := papers.get(paper_id))]}
 
-    # No results found, check for closest match
-    suggestion = find_closest_match(request.keyword, db)
-    return {"results": [], "suggestion": suggestion} if suggestion else {"results": []}
+    # No results found, check for closest matches
+    suggestions = find_closest_matches(request.keyword, db)
+    if not suggestions:
+        return {"results": []}
+    return {"results": [], "suggestion": suggestions[0]["text"], "suggestions": suggestions}
 
 # ✅ Fetch Trending Topics
 @router.get("/trending", response_model=list[TrendingTopicsResponse])
-def get_trending_topics(db: Session = Depends(get_db)):
-    thirty_days_ago = datetime.datetime.utcnow() - datetime.timedelta(days=30)
-    recent_logs = (
-        db.query(SearchLog.keyword, func.count(SearchLog.keyword).label("count"))
-        .filter(SearchLog.date_searched >= thirty_days_ago)
-        .group_by(SearchLog.keyword)
-        .order_by(func.count(SearchLog.keyword).desc())
-        .limit(10)
-        .all()
-    )
-    return [{"keyword": log[0], "count": log[1]} for log in recent_logs]
+def get_trending_topics(days: int = Query(30, ge=1, le=TRENDING_RETENTION_DAYS), limit: int = Query(10, ge=1, le=100)):
+    return trending_topics.top(limit=limit, days=days)
 
 # ✅ Generate PDF Report
 from fastapi.responses import FileResponse
 
 @router.post("/generate_report")
-def generate_pdf_report(db: Session = Depends(get_db)):
-    topics = get_trending_topics(db)
+def generate_pdf_report():
+    topics = trending_topics.top(limit=10, days=30)
     pdf = FPDF()
     pdf.set_auto_page_break(auto=True, margin=15)
     pdf.add_page()
@@ -126,7 +131,9 @@ def delete_search_log(log_id: int, db: Session = Depends(get_db)):
     if not search_log:
         raise HTTPException(status_code=404, detail="Search log not found")
 
+    keyword, date_searched = search_log.keyword, search_log.date_searched
     db.delete(search_log)
     db.commit()
+    trending_topics.discard(keyword, date_searched)
 
     return {"message": "Search log deleted"}
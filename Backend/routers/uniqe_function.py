@@ -1,33 +1,15 @@
+import json
 import os
-import shutil
-from operator import itemgetter
-
-from decouple import config
-from langchain_community.document_loaders import WebBaseLoader, PyPDFLoader
-from langchain_core.prompts.chat import ChatPromptTemplate
-from langchain_core.runnables import RunnablePassthrough, RunnableParallel
-from langchain_openai import ChatOpenAI
-from langchain_openai import OpenAIEmbeddings
-from langchain_qdrant import QdrantVectorStore
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from qdrant_client import QdrantClient, models
-
-# Qdrant Configuration
-qdrant_api_key = config("QDRANT_API_KEY")
-qdrant_url = config("QDRANT_URL")
-collection_name = "WebSites"
-
-client = QdrantClient(
-    url=qdrant_url,
-    api_key=qdrant_api_key
-)
-
-# Langchain Model Configuration
-model = ChatOpenAI(
-    model_name="gpt-4-turbo-preview",
-    openai_api_key=config("OPENAI_API_KEY"),
-    temperature=0,
-)
+
+from Backend.core.answer_cache import answer_cache
+from Backend.core.ingestion import find_paper_by_path, is_ingesting
+from Backend.core.page_text import load_pages, remove_pages
+from Backend.core.rag import rag
+from Backend.core.storage import UploadTooLarge, store_upload
+from Backend.core.vector_indexing import VectorIndexer, index_jobs, pdf_source, submit_index, url_source
+
+# The Qdrant client, embeddings and chat model live in Backend.core.rag and are created on
+# first use (or at startup with RAG_WARM_UP); everything below is built from them lazily too.
 
 # Prompt Template
 prompt_template = """
@@ -38,109 +20,156 @@ Question: {question}
 Answer:
 """
 
-prompt = ChatPromptTemplate.from_template(prompt_template)
-
-# Define Vector Store
-vector_store = None
 
+# Text Splitter
+def create_text_splitter():
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
 
-def create_collection_if_not_exists(collection_name):
-    try:
-        # Try to get the collection
-        client.get_collection(collection_name=collection_name)
-        print(f"Collection {collection_name} already exists.")
-    except Exception as e:
-        # If collection doesn't exist, create it
-        print(f"Collection {collection_name} does not exist. Creating now...")
-        client.create_collection(
-            collection_name=collection_name,
-            vectors_config=models.VectorParams(size=1536, distance=models.Distance.COSINE)
-        )
-        print(f"Collection {collection_name} created successfully")
-
-
-# Ensure collection exists before any operation
-create_collection_if_not_exists(collection_name)
-
-# Initialize Vector Store after collection check
-vector_store = QdrantVectorStore(
-    client=client,
-    collection_name=collection_name,
-    embedding=OpenAIEmbeddings(
-        api_key=os.getenv("OPENAI_API_KEY")
+    return RecursiveCharacterTextSplitter(
+        chunk_size=1000,
+        chunk_overlap=20,
+        length_function=len
     )
-)
 
-# Text Splitter
-text_splitter = RecursiveCharacterTextSplitter(
-    chunk_size=1000,
-    chunk_overlap=20,
-    length_function=len
-)
 
+# Batched, concurrent upserts with deterministic point IDs (INDEX_BATCH_SIZE, INDEX_CONCURRENCY)
+def create_indexer():
+    indexer = VectorIndexer(rag.vector_store, on_change=answer_cache.invalidate)  # Answers may change with the collection
+    indexer.ensure_source_index()
+    return indexer
+
+
+# Langchain RAG setup
+def create_retriever():
+    return rag.vector_store.as_retriever()
+
+
+# Chunks of a website, to be indexed under its URL
+def load_website_chunks(url: str) -> list:
+    from langchain_community.document_loaders import WebBaseLoader
 
-# Function to upload website data to collection
-def upload_website_to_collection(url: str):
     loader = WebBaseLoader(url)
-    docs = loader.load_and_split(text_splitter)
+    docs = loader.load_and_split(rag.get("text_splitter", create_text_splitter))
     for doc in docs:
         doc.metadata = {"source_url": url}
+    return docs
 
-    vector_store.add_documents(docs)
-    return f"Successfully uploaded {len(docs)} documents to collection {collection_name} from {url}"
 
+def load_pdf_chunks(file_path: str, source_file: str = None) -> list:
+    from langchain_core.documents import Document
 
-# Example upload of website data to collection
-# upload_website_to_collection("https://hamel.dev/blog/posts/evals/")
+    # Page text comes from the shared text store; the PDF is only parsed if it was never extracted
+    source_file = source_file or os.path.basename(file_path)
+    pages = [Document(page_content=text, metadata={"source_file": source_file, "page": number})
+             for number, text in enumerate(load_pages(file_path)) if text.strip()]
+    return rag.get("text_splitter", create_text_splitter).split_documents(pages)
 
-# Langchain RAG setup
-retriever = vector_store.as_retriever()
 
+# The prompt and model; retrieval runs before it, by question or by the question's vector
+def create_answer_chain():
+    from langchain_core.prompts.chat import ChatPromptTemplate
+
+    return ChatPromptTemplate.from_template(prompt_template) | rag.model
+
+
+# Chunks retrieved per question
+RETRIEVAL_K = 4
 
-def upload_pdf_to_collection(file_path: str):
-    loader = PyPDFLoader(file_path)
-    docs = loader.load_and_split(text_splitter)
-    for doc in docs:
-        doc.metadata = {"source_file": os.path.basename(file_path)}
-
-    vector_store.add_documents(docs)
-    return f"Successfully uploaded {len(docs)} documents to collection {collection_name} from {file_path}"
-
-
-def create_chain():
-    chain = (
-            {
-                "context": retriever.with_config(top_k=4),
-                "question": RunnablePassthrough(),
-            }
-            | RunnableParallel({
-        "response": prompt | model,
-        "context": itemgetter("context"),
-    })
-    )
-    return chain
 
+async def lookup_answer(question: str):
+    """Cached answer (or None) and the question's vector, which is only computed for semantic matching."""
+    embed_query = None
+    if answer_cache.semantic:
+        embed_query = (await rag_resource("embeddings")).aembed_query
+    return await answer_cache.aget(question, embed_query)
 
-def get_answer_and_docs(question: str):
+
+async def get_retrieve(vector=None):
+    """Retrieval for one question; a question already embedded by the cache lookup is not embedded again."""
+    if vector is None:
+        retriever = await rag_resource("retriever", create_retriever)
+        return lambda question: retriever.with_config(top_k=RETRIEVAL_K).ainvoke(question)
+    vector_store = await rag_resource("vector_store")
+    return lambda question: vector_store.asimilarity_search_by_vector(vector.tolist(), k=RETRIEVAL_K)
+
+
+async def get_answer_and_docs(question: str):
     print(f"Question: {question}")
-    chain = create_chain()
-    response = chain.invoke(question)
-    answer = response["response"].content
-    context = response["context"]
+    # Repeat (or, with ANSWER_CACHE_SIMILARITY, near-duplicate) questions skip retrieval and the model
+    generation = answer_cache.generation
+    cached, vector = await lookup_answer(question)
+    if cached is not None:
+        return {**cached, "cached": True}
+
+    # Built once; runnables are stateless and safe to share between requests
+    retrieve = await get_retrieve(vector)
+    answer_chain = await rag_resource("answer_chain", create_answer_chain)
+    docs = await retrieve(question)
+    response = await answer_chain.ainvoke({"context": docs, "question": question})
+    answer = response.content
+    context = [doc.dict() for doc in docs]
     print(f"Answer: {answer}")
+    if answer:
+        answer_cache.set(question, {"answer": answer, "context": context}, vector, generation)
     return {
         "answer": answer,
-        "context": context
+        "context": context,
+        "cached": False
     }
 
 
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def stream_answer_and_docs(question: str, retrieve, answer_chain, vector=None, generation: int = None):
+    """Server-Sent Events: the retrieved context as soon as it is found, then the answer token by token."""
+    tokens = []
+    try:
+        docs = await retrieve(question)
+        context = [doc.dict() for doc in docs]
+        yield sse_event("context", context)
+        async for chunk in answer_chain.astream({"context": docs, "question": question}):
+            if chunk.content:
+                tokens.append(chunk.content)
+                yield sse_event("token", chunk.content)
+    except Exception as e:
+        print(e)
+        yield sse_event("error", f"An error occurred: {str(e)}")
+        return
+    if tokens:
+        answer_cache.set(question, {"answer": "".join(tokens), "context": context}, vector, generation)
+    yield sse_event("done", None)
+
+
+async def replay_cached_answer(cached: dict):
+    yield sse_event("context", cached["context"])
+    yield sse_event("token", cached["answer"])
+    yield sse_event("done", None)
+
+
 # FastAPI Router setup for chat and indexing
+from datetime import datetime
+from typing import Optional
+
 from fastapi import HTTPException, APIRouter, UploadFile, File
 from pydantic import BaseModel
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, StreamingResponse
 
 router = APIRouter()
 
+# Tells whether a chat answer came from the answer cache ("hit") or was generated ("miss")
+ANSWER_CACHE_HEADER = "X-Answer-Cache"
+
+
+# A RAG resource for a handler; a backend that cannot be reached yet is a 503, and is retried next time
+async def rag_resource(name: str, factory=None):
+    try:
+        return await rag.aget(name, factory)
+    except Exception as e:
+        print(e)
+        raise HTTPException(status_code=503, detail=f"RAG backend unavailable: {str(e)}")
+
 
 # Define the payload structure for /chat
 class Message(BaseModel):
@@ -152,13 +181,28 @@ class URLPayload(BaseModel):
     url: str
 
 
+# Status of a background indexing job
+class IndexJobResponse(BaseModel):
+    id: str
+    status: str  # queued, running, done or failed
+    source: str
+    filename: Optional[str] = None
+    url: Optional[str] = None
+    total_chunks: Optional[int] = None  # Known once the document is loaded and split
+    indexed_chunks: int = 0
+    deleted_chunks: int = 0  # Stale chunks of an earlier index of the same source
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+
 # Chat endpoint
 @router.post("/chat", summary="Chat with the RAG API through this endpoint")
 async def chat(payload: Message):
     try:
         # Extract the message from the payload
         message = payload.message
-        response = get_answer_and_docs(message)
+        response = await get_answer_and_docs(message)
 
         # Check if an answer exists
         if not response or not response.get("answer"):
@@ -175,41 +219,77 @@ async def chat(payload: Message):
         response_content = {
             "question": message,
             "answer": response["answer"],
-            "document": [doc.dict() for doc in response["context"]],
+            "document": response["context"],
         }
-        return JSONResponse(content=response_content, status_code=200)
+        return JSONResponse(content=response_content, status_code=200,
+                            headers={ANSWER_CACHE_HEADER: "hit" if response["cached"] else "miss"})
 
+    except HTTPException:
+        raise  # e.g. 503 while the RAG backend is unreachable
     except Exception as e:
         # Handle unexpected errors
         print(e)
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
 
 
-# Indexing endpoint
-@router.post("/indexing", summary="Index a website through this endpoint")
+# Streaming chat endpoint: "context", then "token" events, then "done" (or "error")
+@router.post("/chat/stream", summary="Chat with the RAG API, streaming the answer as Server-Sent Events")
+async def chat_stream(payload: Message):
+    generation = answer_cache.generation
+    cached, vector = await lookup_answer(payload.message)
+    if cached is not None:
+        events = replay_cached_answer(cached)
+    else:
+        # Resolved before the response starts, so an unreachable backend is still a 503
+        retrieve = await get_retrieve(vector)
+        answer_chain = await rag_resource("answer_chain", create_answer_chain)
+        events = stream_answer_and_docs(payload.message, retrieve, answer_chain, vector, generation)
+    return StreamingResponse(events, media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no",
+                                      ANSWER_CACHE_HEADER: "hit" if cached is not None else "miss"})
+
+
+# Embedding and answer cache statistics; embeddings are null until something has created them
+@router.get("/rag/stats", summary="Embedding and answer cache hit/miss counters")
+def rag_stats():
+    embeddings = rag.loaded("embeddings")
+    return {"embeddings": embeddings.stats() if embeddings is not None else None, "answers": answer_cache.stats()}
+
+
+# Indexing endpoint; indexing runs in the background, poll /indexing/jobs/{job_id} for progress
+@router.post("/indexing", summary="Index a website through this endpoint", status_code=202,
+             response_model=IndexJobResponse)
 async def indexing(url: str):
-    try:
-        response = upload_website_to_collection(url)
-        return JSONResponse(content={"response": response}, status_code=200)
-    except Exception as e:
-        return JSONResponse(content={"error": str(e)}, status_code=500)
+    indexer = await rag_resource("indexer", create_indexer)
+    return await submit_index(indexer, url_source(url), lambda: load_website_chunks(url), url=url)
 
 
-@router.post("/index-pdf", summary="Index a PDF file through this endpoint")
+@router.post("/index-pdf", summary="Index a PDF file through this endpoint", status_code=202,
+             response_model=IndexJobResponse)
 async def index_pdf(file: UploadFile = File(...)):
-    try:
-        # Save uploaded file temporarily
-        temp_path = f"temp_files/{file.filename}"
-        os.makedirs("temp_files", exist_ok=True)
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        # Upload to vector store
-        response = upload_pdf_to_collection(temp_path)
-
-        # Clean up
-        os.remove(temp_path)
+    indexer = await rag_resource("indexer", create_indexer)
 
-        return JSONResponse(content={"response": response}, status_code=200)
-    except Exception as e:
-        return JSONResponse(content={"error": str(e)}, status_code=500)
+    # Store the upload by content hash; an already-uploaded paper reuses its stored page text
+    try:
+        stored = await store_upload(file)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    def cleanup():
+        # Remove files that are not research papers once they are indexed; the same bytes may be
+        # uploaded as a paper meanwhile (one content-addressed path), so leave files being ingested
+        if stored.created and not is_ingesting(stored.path) and not find_paper_by_path(stored.path):
+            os.remove(stored.path)
+            remove_pages(stored.path)
+
+    return await submit_index(indexer, pdf_source(stored.path), lambda: load_pdf_chunks(stored.path, file.filename),
+                              cleanup=cleanup, filename=file.filename)
+
+
+@router.get("/indexing/jobs/{job_id}", summary="Progress of a background indexing job",
+            response_model=IndexJobResponse)
+async def get_index_job(job_id: str):
+    job = index_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Indexing job not found")
+    return job
@@ -35,4 +35,15 @@ class AuthorResponse(AuthorBase):
     achievements: List[AchievementResponse] = []
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+# Schema for list/detail reads with ?view= or ?fields= (only the selected fields are returned)
+class AuthorPartial(BaseModel):
+    id: int
+    name: Optional[str] = None
+    affiliation: Optional[str] = None
+    email: Optional[EmailStr] = None
+    areas_of_expertise: Optional[str] = None
+    achievements: Optional[List[AchievementResponse]] = None
+    achievement_count: Optional[int] = None
+    latest_achievement_year: Optional[int] = None
@@ -27,3 +27,16 @@ class CommentResponse(CommentCreate):
     model_config = {
         "from_attributes": True  # replaces 'orm_mode = True' in Pydantic v2
     }
+
+
+# Schema for list/detail reads with ?view= or ?fields= (only the selected fields are returned)
+class CommentPartial(BaseModel):
+    id: int
+    name: Optional[str] = None
+    comment: Optional[str] = None
+    paper_id: Optional[int] = None
+    paper_title: Optional[str] = None
+    created_at: Optional[datetime] = None
+    likes: Optional[int] = None
+    dislikes: Optional[int] = None
+    approved: Optional[bool] = None
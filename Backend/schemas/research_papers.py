@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional
+from datetime import datetime
 
 # Schema for creating a research paper
 class ResearchPaperCreate(BaseModel):
@@ -11,7 +12,43 @@ class ResearchPaperCreate(BaseModel):
 # Schema for returning a research paper
 class ResearchPaperResponse(ResearchPaperCreate):
     id: int
+    year: Optional[int] = None  # Not every PDF states its year
     file_path: str
 
     class Config:
         from_attributes = True  # ✅ Pydantic v2 Fix
+
+# Schema for the status of a background upload
+class UploadJobResponse(BaseModel):
+    id: str
+    status: str  # queued, running, done or failed
+    filename: str
+    paper: Optional[ResearchPaperResponse] = None
+    duplicate: bool = False  # True when identical bytes had already been ingested
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+# Schema for one file of a batch upload
+class BatchUploadItem(BaseModel):
+    filename: str
+    status: str  # created, duplicate or failed
+    paper: Optional[ResearchPaperResponse] = None
+    job_id: Optional[str] = None  # Set when a duplicate is still being ingested by an upload job
+    error: Optional[str] = None
+
+# Schema for the report of a batch upload
+class BatchUploadResponse(BaseModel):
+    created: int
+    duplicates: int
+    failed: int
+    files: list[BatchUploadItem]
+
+# Schema for list/detail reads with ?view= or ?fields= (only the selected fields are returned)
+class ResearchPaperPartial(BaseModel):
+    id: int
+    title: Optional[str] = None
+    author: Optional[str] = None
+    year: Optional[int] = None
+    introduction: Optional[str] = None
+    file_path: Optional[str] = None
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 
 # Schema for search log entry
@@ -16,6 +16,8 @@ class SearchLogSchema(BaseModel):
 # Request schema for searching a paper
 class SearchLogRequest(BaseModel):
     keyword: str
+    limit: int = Field(20, ge=1, le=100)  # Page size for ranked results
+    offset: int = Field(0, ge=0)
 
 # Response schema for a search result
 class SearchResponse(BaseModel):
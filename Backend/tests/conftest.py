@@ -0,0 +1,41 @@
+import os
+import tempfile
+
+# The engines are created from MYSQL_URL on import, so point them at a throwaway SQLite file first
+os.environ["MYSQL_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+os.environ.pop("ASYNC_MYSQL_URL", None)
+
+import pytest
+from sqlalchemy import event
+
+from Backend.core.database import Base, engine
+
+
+@pytest.fixture
+def db_tables():
+    from Backend.models.authors import Achievement, Author
+
+    tables = [Author.__table__, Achievement.__table__]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    yield
+    Base.metadata.drop_all(bind=engine, tables=tables)
+
+
+@pytest.fixture
+def count_queries():
+    """Number of statements the sync engine runs inside the `with` block."""
+    class Counter:
+        count = 0
+
+        def __enter__(self):
+            self.count = 0
+            event.listen(engine, "before_cursor_execute", self._count)
+            return self
+
+        def __exit__(self, *exc):
+            event.remove(engine, "before_cursor_execute", self._count)
+
+        def _count(self, *args):
+            self.count += 1
+
+    return Counter()
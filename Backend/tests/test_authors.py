@@ -0,0 +1,52 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from Backend.core.database import SessionLocal
+from Backend.models.authors import Achievement, Author
+from Backend.routers import authors
+
+AGGREGATES = "id,name,achievement_count,latest_achievement_year"
+
+
+@pytest.fixture
+def client(db_tables):
+    app = FastAPI()
+    app.include_router(authors.router, prefix="/api")
+    return TestClient(app)
+
+
+def add_authors(count: int, start: int = 0):
+    with SessionLocal() as db:
+        for number in range(start, start + count):
+            author = Author(name=f"Author {number}", email=f"author{number}@example.com")
+            author.achievements = [Achievement(description=f"Award {year}", year=year) for year in (2020, 2023)]
+            db.add(author)
+        db.commit()
+
+
+def list_authors(client, count_queries, **params) -> tuple[int, list]:
+    with count_queries:
+        response = client.get("/api/authors", params={"limit": 200, **params})
+    assert response.status_code == 200
+    return count_queries.count, response.json()
+
+
+@pytest.mark.parametrize("params, queries", [
+    ({}, 2),  # Authors, then their achievements in one selectin query
+    ({"fields": AGGREGATES}, 1),  # Aggregates are subqueries of the author SELECT
+])
+def test_list_authors_query_count_does_not_grow(client, count_queries, params, queries):
+    add_authors(5)
+    small_count, small = list_authors(client, count_queries, **params)
+    add_authors(45, start=5)
+    large_count, large = list_authors(client, count_queries, **params)
+
+    assert (len(small), len(large)) == (5, 50)
+    assert small_count == large_count == queries
+
+
+def test_list_authors_aggregates(client, count_queries):
+    add_authors(3)
+    _, rows = list_authors(client, count_queries, fields=AGGREGATES)
+    assert [(row["achievement_count"], row["latest_achievement_year"]) for row in rows] == [(2, 2023)] * 3
@@ -0,0 +1,19 @@
+// List endpoints return one page at a time; the next page's cursor is in the X-Next-Cursor header
+export const PAGE_SIZE = 200; // The backend's MAX_PAGE_SIZE
+
+// ✅ Fetch every page of a list endpoint and return the rows as one array
+export async function fetchAllPages(url, options = {}) {
+    const rows = [];
+    let cursor = null;
+    do {
+        const pageUrl = new URL(url);
+        pageUrl.searchParams.set("limit", PAGE_SIZE);
+        if (cursor) pageUrl.searchParams.set("cursor", cursor);
+
+        const response = await fetch(pageUrl, options);
+        if (!response.ok) throw new Error(`Failed to fetch ${url}: ${response.status}`);
+        rows.push(...(await response.json()));
+        cursor = response.headers.get("X-Next-Cursor");
+    } while (cursor);
+    return rows;
+}
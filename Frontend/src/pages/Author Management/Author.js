@@ -1,5 +1,5 @@
 import React, { useEffect, useState } from "react";
-import axios from "axios";
+import { fetchAllPages } from "../../api/pagination";
 
 const AuthorsList = () => {
     const [authors, setAuthors] = useState([]);
@@ -10,9 +10,9 @@ const AuthorsList = () => {
     useEffect(() => {
         const fetchAuthors = async () => {
             try {
-                const res = await axios.get("http://localhost:8005/api/authors");
-                setAuthors(res.data);
-                setFilteredAuthors(res.data); // Initially show all authors
+                const data = await fetchAllPages("http://localhost:8005/api/authors");
+                setAuthors(data);
+                setFilteredAuthors(data); // Initially show all authors
             } catch (err) {
                 console.error("Error fetching authors:", err);
             } finally {
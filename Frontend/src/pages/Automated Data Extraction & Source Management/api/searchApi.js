@@ -1,12 +1,12 @@
 import axios from "axios";
+import { fetchAllPages } from "../../../api/pagination";
 
 const BASE_URL = "http://127.0.0.1:8005"; // Adjust if needed
 
 // ✅ Fetch search logs
 export async function fetchSearchLogs() {
     try {
-        const response = await axios.get(`${BASE_URL}/api/search/logs`);
-        return response.data;
+        return await fetchAllPages(`${BASE_URL}/api/search/logs`);
     } catch (error) {
         console.error("Error fetching logs:", error);
         return [];
@@ -1,6 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import axios from 'axios';
 import { FileText, User, Search , MessageSquare } from 'lucide-react'; // Make sure you have lucide-react installed
+import { fetchAllPages } from '../../api/pagination';
 
 const API = 'http://localhost:8005/comments';
 
@@ -20,8 +21,7 @@ export default function CommentManagement() {
     }, []);
 
     const fetchAllComments = async () => {
-        const res = await axios.get(`${API}/moderation`);
-        setComments(res.data);
+        setComments(await fetchAllPages(`${API}/moderation`));
     };
 
     const approveComment = async (id) => {
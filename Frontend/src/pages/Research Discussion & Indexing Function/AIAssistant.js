@@ -16,6 +16,18 @@ const AIAssistant = () => {
         setRecentActivity((prev) => [newActivity, ...prev]);
     };
 
+    // Indexing runs in the background; poll its job until it finishes
+    const waitForIndexJob = async (job) => {
+        while (job.status === "queued" || job.status === "running") {
+            await new Promise((resolve) => setTimeout(resolve, 1000));
+            const res = await fetch(`http://localhost:8005/api/indexing/jobs/${job.id}`);
+            job = await res.json();
+        }
+        return job.status === "done"
+            ? `${job.indexed_chunks} chunks indexed`
+            : `Failed: ${job.error || "unknown error"}`;
+    };
+
     const handleSearch = async () => {
         if (!query.trim()) return;
         setLoading(true);
@@ -48,7 +60,8 @@ const AIAssistant = () => {
                 body: formData,
             });
             const data = await res.json();
-            addActivity("pdf", `Uploaded PDF: ${selectedFile.name} — ${data.response || "No confirmation"}`);
+            const result = res.ok ? await waitForIndexJob(data) : data.detail;
+            addActivity("pdf", `Uploaded PDF: ${selectedFile.name} — ${result || "No confirmation"}`);
             setSelectedFile(null);
         } catch (err) {
             console.error("PDF upload failed", err);
@@ -67,7 +80,8 @@ const AIAssistant = () => {
                 method: "POST"
             });
             const data = await res.json();
-            addActivity("link", `Indexed: ${query} — ${data.response || "No confirmation message"}`);
+            const result = res.ok ? await waitForIndexJob(data) : data.detail;
+            addActivity("link", `Indexed: ${query} — ${result || "No confirmation message"}`);
             setQuery("");
         } catch (err) {
             console.error("Indexing failed", err);
@@ -4,6 +4,7 @@ import { FiArrowRight } from "react-icons/fi";
 import { BsTwitter, BsLinkedin, BsGithub } from "react-icons/bs";
 import { useNavigate } from "react-router-dom";
 import { Link } from "react-router-dom";
+import { fetchAllPages } from "../../api/pagination";
 
 
 const HomePage = () => {
@@ -15,10 +16,7 @@ const HomePage = () => {
     useEffect(() => {
         const fetchPapers = async () => {
             try {
-                const response = await fetch("http://localhost:8005/api/papers"); // Adjust API endpoint if needed
-                if (!response.ok) throw new Error("Failed to fetch papers");
-
-                const data = await response.json();
+                const data = await fetchAllPages("http://localhost:8005/api/papers/"); // Adjust API endpoint if needed
                 setPapers(data);
                 setFilteredPapers(data); // Initially, show all papers
             } catch (error) {
@@ -44,10 +42,9 @@ const HomePage = () => {
     };
 
 
-    const handleDownload = async (filePath) => {
+    const handleDownload = async (paper) => {
         try {
-            const cleanedFilePath = filePath.replace(/\\/g, "/").replace("uploads/", "");
-            const response = await fetch(`http://localhost:8005/api/download/${encodeURIComponent(cleanedFilePath)}`, {
+            const response = await fetch(`http://localhost:8005/api/papers/${paper.id}/file?download=true`, {
                 method: "GET",
             });
 
@@ -57,7 +54,7 @@ const HomePage = () => {
             const url = window.URL.createObjectURL(blob);
             const a = document.createElement("a");
             a.href = url;
-            a.download = cleanedFilePath.split("/").pop();
+            a.download = `${paper.title || `paper-${paper.id}`}.pdf`;
             document.body.appendChild(a);
             a.click();
             document.body.removeChild(a);
@@ -156,7 +153,7 @@ const HomePage = () => {
                                     <span style={{ color: "#555" }}>{paper.citations} citations</span>
                                     <div style={{ display: "flex", gap: "12px" }}>
                                         <button
-                                            onClick={() => handleDownload(paper.file_path)}
+                                            onClick={() => handleDownload(paper)}
                                             style={{
                                                 backgroundColor: "#000", color: "#FFF",
                                                 padding: "8px 12px", borderRadius: "6px",
@@ -16,6 +16,7 @@ import {
 
 import jsPDF from "jspdf";
 import autoTable from "jspdf-autotable";
+import { fetchAllPages } from "../../api/pagination";
 
 const ResearchPapersManagement = () => {
     const [papers, setPapers] = useState([]);
@@ -37,11 +38,7 @@ const ResearchPapersManagement = () => {
 
     const fetchPapers = async () => {
         try {
-            const response = await fetch("http://localhost:8005/api/papers/");
-            if (response.ok) {
-                const data = await response.json();
-                setPapers(data);
-            }
+            setPapers(await fetchAllPages("http://localhost:8005/api/papers/"));
         } catch (error) {
             console.error("Error fetching papers:", error);
         }
@@ -72,9 +69,25 @@ const ResearchPapersManagement = () => {
                 body: formData,
                 headers: { "Authorization": `Bearer ${token}` },
             });
-            if (response.ok) {
+            const data = await response.json();
+            if (!response.ok) {
+                alert("Error uploading file: " + (data.detail || response.statusText));
+                return;
+            }
+            // Extraction runs in the background; poll the upload job until it finishes
+            let job = data;
+            while (job.status === "queued" || job.status === "running") {
+                await new Promise((resolve) => setTimeout(resolve, 1000));
+                const res = await fetch(`http://localhost:8005/api/upload/jobs/${job.id}`, {
+                    headers: { "Authorization": `Bearer ${token}` },
+                });
+                job = await res.json();
+            }
+            if (job.status === "done") {
                 fetchPapers();
-                alert("File uploaded successfully!");
+                alert(job.duplicate ? "This file was already uploaded." : "File uploaded successfully!");
+            } else {
+                alert("Error uploading file: " + (job.error || job.detail || "unknown error"));
             }
         } catch (error) {
             alert("Error uploading file: " + error.message);